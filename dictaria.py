@@ -1,27 +1,130 @@
+from __future__ import annotations
+
+import time
+_PROCESS_T0 = time.perf_counter()  # start of the startup profile
+
 import os
 import sys
 import json
+import socket
+import struct
+import io
+import bisect
+import http.client
+import http.server
+import urllib.parse
+import mimetypes
+import getpass
+import argparse
 import tempfile
+import platform
 import threading
 import queue
-import time
+from collections import deque
+import contextlib
+import logging
+import logging.handlers
 import concurrent.futures
-from typing import NamedTuple, List, Dict
-
-import numpy as np
-import sounddevice as sd
-import soundfile as sf
-from faster_whisper import WhisperModel
+import multiprocessing
+import multiprocessing.shared_memory
+import importlib
+import dataclasses
+import weakref
+from collections import OrderedDict
+import math
+import shutil
+import stat
+import sqlite3
+import types
+from types import SimpleNamespace
+from typing import NamedTuple, List, Dict, Iterator
 
 import tkinter as tk
 from tkinter import scrolledtext, PhotoImage
 
+# --------------------
+# LAZY IMPORTS & STARTUP PROFILE
+# --------------------
+class StartupProfile:
+    """Timings of the import and init phases, printed with --profile-startup."""
+
+    def __init__(self):
+        self.enabled = False
+        self.phases: List[tuple[str, float, float]] = []  # (name, offset from process start, duration)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: float):
+        with self._lock:
+            self.phases.append((name, start - _PROCESS_T0, end - start))
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("Startup profile (offset from process start, duration):", file=sys.stderr)
+        with self._lock:
+            for name, offset, duration in sorted(self.phases, key=lambda p: p[1]):
+                print(f"  {offset:8.3f}s  {'+' + format(duration, '.3f') + 's' if duration else '':>9}  {name}", file=sys.stderr)
+
+STARTUP = StartupProfile()
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a heavy module that imports it on first attribute access.
+
+    After the import the real module's namespace is copied in, so later
+    lookups cost the same as on the module itself.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_module = None
+        self._lazy_lock = threading.Lock()
+
+    def __getattr__(self, attr: str):
+        # Only reached for names not copied in yet
+        return getattr(self._lazy_load(), attr)
+
+    def _lazy_load(self) -> types.ModuleType:
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                with STARTUP.phase(f"import {self.__name__}"):
+                    module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self._lazy_module = module
+            return self._lazy_module
+
+# The UI needs none of these, so the window appears before they load; _load_model_task imports them
+np = LazyModule("numpy")
+sd = LazyModule("sounddevice")
+sf = LazyModule("soundfile")
+ctranslate2 = LazyModule("ctranslate2")
+faster_whisper = LazyModule("faster_whisper")
+HEAVY_MODULES = (np, sd, sf, ctranslate2, faster_whisper)
+
+def import_heavy_modules():
+    for module in HEAVY_MODULES:
+        module._lazy_load()
+
 # --------------------
 # CONSTANTS & CONFIGURATION
 # --------------------
 
 # Hotkey settings
-SIGNAL_FILE = "/tmp/dictaria_signal_f9.txt"  # Used only on macOS with Hammerspoon
+SIGNAL_FILE = "/tmp/dictaria_signal_f9.txt"  # Fallback for older Hammerspoon configs; prefer the control socket
+SIGNAL_POLL_MS = 200          # when the control socket is unavailable
+SIGNAL_LEGACY_POLL_MS = 1000  # while the control socket serves, for configs that still touch the file
+CONTROL_SOCKET_NAME = "control.sock"  # line commands: toggle, start, stop, lang <code>, status
 IS_MAC = sys.platform == "darwin"
 
 if IS_MAC:
@@ -35,11 +138,109 @@ else:
 
 # Model settings
 MODEL_SIZE = "medium"
+DRAFT_MODEL_SIZE = "base"  # fast first pass when two-pass mode is on
+TWO_PASS_MODE = False
 DEVICE = "cpu"
 COMPUTE_TYPE = "int8"
+BEAM_SIZE = 5
 SAMPLE_RATE = 16000
+
+# Adaptive decoding: short clips are decoded greedily, and only low-confidence segments get the full beam
+ADAPTIVE_DECODING = True
+ADAPTIVE_MAX_CLIP_S = 10.0             # longer clips go straight to the beam
+ADAPTIVE_MIN_AVG_LOGPROB = -0.5        # greedy segments below this are decoded again
+ADAPTIVE_MAX_COMPRESSION_RATIO = 2.4   # as are repetitive ones above this
+ADAPTIVE_PAD_S = 0.2                   # context added around a segment that is decoded again
 INTERNAL_MIC_HINT = "MacBook"
 CONFIG_PATH = os.path.expanduser("~/.dictaria_config.json")
+CONFIG_VERSION = 2
+CONFIG_WATCH_S = 1.0  # how often the config file is checked for outside edits
+MODEL_CHOICES = ("base", "small", "medium", "large-v3")  # Options > Model
+BEAM_SIZE_CHOICES = (1, 5, 10)
+
+# Hardware calibration (first run, or python dictaria.py tune): the fastest profile is cached in the config
+TUNE_CLIP_S = 5.0
+TUNE_REPEATS = 2
+TUNE_COMPUTE_TYPES = ("int8", "int8_float32", "int8_float16", "int8_bfloat16", "float16", "bfloat16", "float32")  # preference order on ties
+
+# Engine daemon (python dictaria.py daemon): owns the model, GUI clients connect over a Unix socket
+ENGINE_SOCKET_NAME = "engine.sock"
+ENGINE_CONNECT_TIMEOUT_S = 0.5
+
+# Worker process: without an engine daemon the model runs in a child process, so decodes can be cancelled
+WORKER_PROCESS = True
+WORKER_CANCEL_GRACE_S = 0.3  # after this the worker is killed (and restarted) instead of waiting for a segment boundary
+
+# Transcription service (python dictaria.py serve): HTTP on localhost, requests are micro-batched
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+SERVE_MAX_QUEUE = 16            # requests waiting or running; more get 503
+SERVE_MAX_BATCH = 8
+SERVE_BATCH_WAIT_S = 0.05       # how long the first request of a batch waits for others
+SERVE_BATCH_MAX_CLIP_S = 30.0   # longer uploads run on their own
+SERVE_MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+SERVE_SOCKET_TIMEOUT_S = 30.0   # per read/write on a client connection
+
+# Batch mode (python dictaria.py batch)
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".m4a", ".aac", ".ogg", ".opus", ".webm", ".mp4")
+
+# Take pipeline: stopped takes queue up for the transcription worker while the next one records
+MAX_PENDING_TAKES = 4
+QUEUE_FULL_POLICY = "reject"  # "reject": refuse to start a new take; "drop_oldest": discard the oldest waiting take
+
+# Per-take latency metrics, appended to a rotating JSONL log
+METRICS_LOG_PATH = os.path.expanduser("~/.dictaria_metrics.jsonl")
+METRICS_LOG_MAX_BYTES = 1_000_000
+METRICS_LOG_BACKUPS = 3
+SHOW_TIMINGS = False
+
+# Transcript history: every transcript is kept on disk, the window only holds the most recent lines
+HISTORY_DB_PATH = os.path.expanduser("~/.dictaria_history.sqlite3")
+HISTORY_WIDGET_MAX_LINES = 400
+HISTORY_TRIM_SLACK_LINES = 50  # trim in batches rather than on every insert
+HISTORY_PAGE_ENTRIES = 50
+HISTORY_SEARCH_LIMIT = 200
+
+# Warm stream: keep the input stream open between takes and prepend the last PREROLL_S to each take
+WARM_STREAM_MODE = False
+PREROLL_S = 0.5
+WARM_STREAM_IDLE_S = 10 * 60  # release the microphone after this long without a take (0 = never)
+WARM_STREAM_CHECK_MS = 30_000
+
+# Take cache: recent takes stay in memory (int16) so they can be re-transcribed without re-recording
+TAKE_CACHE_SIZE = 5
+RETRANSCRIBE_BEAM_SIZE = 10
+RETRANSCRIBE_MODEL_SIZES = ("small", "medium", "large-v3")
+RETRANSCRIBE_MODEL_IDLE_S = 5 * 60  # one other size is kept loaded for re-transcription, freed after this long unused
+
+# Long-form mode: takes spill to a memory-mapped file and are decoded in overlapping, checkpointed windows
+LONG_FORM_MODE = False
+LONG_FORM_DIR = os.path.expanduser("~/.dictaria_longform")
+LONG_FORM_WINDOW_S = 30.0   # Whisper's native context
+LONG_FORM_OVERLAP_S = 4.0   # segments are kept by the window whose centre region holds their midpoint
+LONG_FORM_GROW_S = 10 * 60  # spill file is extended in steps of this much audio
+SPILL_GROW_AT = 0.8          # ...from a helper thread, once the mapped part is this full
+
+# Replay audio source (soak tests, no microphone): block size and how far behind it may fall before dropping
+REPLAY_BLOCK_SIZE = 512
+REPLAY_MAX_LAG_BLOCKS = 8
+
+# Recording buffer: allocated up front, but pages only become resident as audio is written
+RECORD_BUFFER_MAX_S = 60 * 60
+
+# Voice activity trimming before decode (thresholds in VadConfig)
+VAD_ENABLED = True
+
+# Debug: set DICTARIA_DEBUG_WAV_DIR to also write every decoded clip there as WAV
+DEBUG_WAV_DIR = os.environ.get("DICTARIA_DEBUG_WAV_DIR", "")
+
+# Streaming settings (transcribe while recording, cutting at pauses)
+STREAMING_MODE = False
+STREAM_POLL_S = 0.25
+STREAM_MIN_CHUNK_S = 4.0
+STREAM_MAX_CHUNK_S = 20.0
+STREAM_SILENCE_S = 0.5
+STREAM_SILENCE_RMS = 0.01
 
 # Theme
 THEME = {
@@ -84,7 +285,13 @@ LANG_DEFS: Dict[str, Language] = {
 }
 
 LANG_CODES: List[str] = list(LANG_DEFS.keys())
-LANG_OPTIONS: List[str] = [f"{v.name} {v.flag}" for v in LANG_DEFS.values()]
+
+# "Auto": the language is detected among LANG_CODES from the first seconds of each take, while recording goes on
+LANG_AUTO = "auto"
+AUTO_DETECT_AFTER_S = 3.0
+AUTO_DETECT_POLL_S = 0.1
+LANG_CHOICES: Dict[str, Language] = {**LANG_DEFS, LANG_AUTO: Language(LANG_AUTO, "🌐", "Auto")}
+LANG_OPTIONS: List[str] = [f"{v.name} {v.flag}" for v in LANG_CHOICES.values()]
 
 # UI messages
 MSG_MODEL_READY = f"[Dictaria Ready. Click REC or Press {HOTKEY_LABEL}]"
@@ -94,134 +301,2529 @@ MSG_LISTENING = "[Listening...]"
 MSG_STOPPING = "[Finalizing audio...]"  
 MSG_PROCESSING = "[Transcribing...]"
 MSG_NO_AUDIO = "[Audio too short or silent]"
+MSG_NO_SPEECH = "[No speech detected]"
+MSG_VAD_TRIMMED = "[Skipped {:.1f}s of {:.1f}s as silence]"
 MSG_ERROR = "[Error: {}]"
 MSG_COPIED = "[Copied to clipboard]"
+MSG_QUEUE_FULL = "[Transcription queue full - wait for pending takes]"
+MSG_TAKE_DROPPED = "[Queue full: dropped waiting take #{}]"
+MSG_FINAL_REPLACED = "[Draft replaced by final transcript]"
+MSG_DRAFT_MODEL_READY = "[Draft model ready]"
+MSG_ENGINE_CONNECTED = "[Using shared engine daemon]"
+MSG_ENGINE_LOST = "[Engine daemon unavailable - loading model locally...]"
+MSG_LONG_FORM_PROGRESS = "[Long recording: window {}/{} ({:.0f}%)]"
+MSG_LONG_FORM_RESUMING = "[Resuming interrupted long recording from {} ({} of {} windows done)]"
+MSG_NOTHING_TO_RETRANSCRIBE = "[No recent take to re-transcribe]"
+MSG_TAKE_NOT_CACHED = "[Take #{} is no longer kept - only the last {} takes can be re-transcribed]"
+MSG_RETRANSCRIBING = "[Re-transcribing take #{} ({})...]"
+MSG_LOADING_RETRANSCRIBE_MODEL = "[Loading model {} for re-transcription - takes keep transcribing meanwhile...]"
+MSG_RETRANSCRIBE_MODEL_BUSY = "[Model {} is still loading, try again when it is ready]"
+MSG_CANCELLED = "[Transcription of take #{} cancelled]"
+MSG_NOTHING_TO_CANCEL = "[Nothing is being transcribed]"
+MSG_WORKER_RESTARTED = "[Transcription worker restarted]"
+MSG_TUNING = "[Calibrating for this machine (first run only)...]"
+MSG_TUNED = "[Calibrated: {} with {} threads]"
+MSG_SWITCHING_MODEL = "[Loading model {} - the current one keeps working until it is ready...]"
+MSG_MODEL_SWITCHED = "[Now using model {}]"
+MSG_MODEL_SWITCHED_DAEMON = "[Now using model {} from the engine daemon - compute type and threads are the daemon's own]"
+MSG_SETTINGS_RELOADED = "[Settings reloaded from config file]"
+MSG_LANGUAGE_DETECTED = "[Detected language: {} {} ({:.0%})]"
 
 # --------------------
 # CONFIGURATION MANAGER
 # --------------------
+class HardwareProfile(NamedTuple):
+    """Backend settings found fastest on one machine, stored in the config."""
+    device: str
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
+    decode_s: float    # calibration clip latency with these settings
+    model_size: str    # model the calibration ran with
+    machine: str       # machine_fingerprint() at calibration time
+
+    def load_kwargs(self) -> Dict:
+        return dict(device=self.device, compute_type=self.compute_type, cpu_threads=self.cpu_threads, num_workers=self.num_workers)
+
+    def applies_here(self) -> bool:
+        """A config copied to another machine, or a changed DEVICE, needs a fresh calibration."""
+        return self.device == DEVICE and self.machine == machine_fingerprint()
+
+def machine_fingerprint() -> str:
+    return f"{platform.system()}-{platform.machine()}-{os.cpu_count()}cpu-{platform.processor() or 'unknown'}"
+
 class ConfigManager:
+    """Settings persisted as JSON at `path`.
+
+    save() only queues the write: a background thread writes the file
+    atomically (temp file, then rename), so the Tk thread never waits on the
+    disk. watch() picks up edits made to the file while the app runs.
+    """
+
     def __init__(self, path: str, default_lang_code: str):
         self.path = path
         self.default_lang_code = default_lang_code
         self.active_language: str = default_lang_code
+        self.streaming: bool = STREAMING_MODE
+        self.two_pass: bool = TWO_PASS_MODE
+        self.show_timings: bool = SHOW_TIMINGS
+        self.warm_stream: bool = WARM_STREAM_MODE
+        self.long_form: bool = LONG_FORM_MODE
+        self.hardware_profile: HardwareProfile | None = None
+        self.performance = PerformanceSettings()
+        self._lock = threading.Lock()
+        self._pending: dict | None = None  # newest unwritten settings; older ones are superseded
+        self._writer: threading.Thread | None = None
+        self._file_stat = None  # (mtime, size) of the file as we last read or wrote it
+        self._failed_stat = None  # ...and of a version that could not be loaded
         self._load()
 
-    def _load(self):
-        if os.path.exists(self.path):
+    def _load(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        try:
+            # Everything is parsed first: a bad value anywhere leaves the current settings untouched
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            loaded_lang = data.get("active", self.default_lang_code)
+            loaded = dict(
+                active_language=loaded_lang if loaded_lang in LANG_CHOICES else self.active_language,
+                streaming=bool(data.get("streaming", STREAMING_MODE)),
+                two_pass=bool(data.get("two_pass", TWO_PASS_MODE)),
+                show_timings=bool(data.get("show_timings", SHOW_TIMINGS)),
+                warm_stream=bool(data.get("warm_stream", WARM_STREAM_MODE)),
+                long_form=bool(data.get("long_form", LONG_FORM_MODE)),
+                hardware_profile=HardwareProfile(**data["hardware_profile"]) if data.get("hardware_profile") else self.hardware_profile,
+                performance=PerformanceSettings.from_json(data.get("performance") or {}),
+            )
+        except Exception as e:
+            self._failed_stat = file_stat  # reported once; the next edit is tried again
+            print(f"Config Load Error: {e}")
+            return False
+        if data.get("version", 1) > CONFIG_VERSION:
+            print(f"Config was written by a newer Dictaria (version {data['version']}); reading the known keys")
+        for name, value in loaded.items():
+            setattr(self, name, value)
+        self._file_stat = file_stat
+        return True
+
+    def to_json(self) -> Dict:
+        return {
+            "version": CONFIG_VERSION,
+            "active": self.active_language,
+            "streaming": self.streaming,
+            "two_pass": self.two_pass,
+            "show_timings": self.show_timings,
+            "warm_stream": self.warm_stream,
+            "long_form": self.long_form,
+            "performance": self.performance.to_json(),
+            "hardware_profile": self.hardware_profile._asdict() if self.hardware_profile else None,
+        }
+
+    def save(self):
+        """Queues the current settings for writing and returns at once."""
+        data = self.to_json()
+        with self._lock:
+            self._pending = data
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_pending, name="dictaria-config-writer", daemon=True)
+                self._writer.start()
+
+    def flush(self, timeout: float = 5.0):
+        """Waits for queued writes, e.g. before the process exits."""
+        writer = self._writer
+        if writer is not None:
+            writer.join(timeout)
+
+    def _write_pending(self):
+        while True:
+            with self._lock:
+                data, self._pending = self._pending, None
+                if data is None:
+                    self._writer = None
+                    return
+            tmp = f"{self.path}.tmp"
             try:
-                with open(self.path, "r") as f:
-                    data = json.load(f)
-                    loaded_lang = data.get("active", self.default_lang_code)
-                    if loaded_lang in LANG_CODES:
-                        self.active_language = loaded_lang
+                with open(tmp, "w") as f:
+                    json.dump(data, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                with self._lock:
+                    os.replace(tmp, self.path)
+                    stat = os.stat(self.path)
+                    self._file_stat = (stat.st_mtime_ns, stat.st_size)
             except Exception as e:
-                print(f"Config Load Error: {e}")
+                print(f"Config Save Error: {e}")
 
-    def save(self):
-        data = {"active": self.active_language}
-        try:
-            with open(self.path, "w") as f:
-                json.dump(data, f)
-        except Exception as e:
-            print(f"Config Save Error: {e}")
+    def watch(self, on_change, interval: float = CONFIG_WATCH_S):
+        """Reloads the file whenever something else changes it, then calls on_change() from the watcher thread."""
+        def run():
+            while True:
+                time.sleep(interval)
+                if self._reload_if_changed():
+                    on_change()
+
+        threading.Thread(target=run, name="dictaria-config-watcher", daemon=True).start()
+
+    def _reload_if_changed(self) -> bool:
+        with self._lock:
+            if self._writer is not None:
+                return False  # our own write is about to replace the file anyway
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return False
+            if (stat.st_mtime_ns, stat.st_size) in (self._file_stat, self._failed_stat):
+                return False
+            return self._load()
+
+# --------------------
+# AUDIO BUFFER
+# --------------------
+class AudioRingBuffer:
+    """Fixed-capacity mono float32 ring buffer written in place by the audio callback.
+
+    Positions are absolute sample counts since the last reset(). Once more than
+    `capacity` samples are written the oldest audio is overwritten and counted
+    in `overflow_samples`.
+    """
+
+    def __init__(self, sample_rate: int = 16000, max_seconds: float = RECORD_BUFFER_MAX_S):
+        self.capacity = int(sample_rate * max_seconds)
+        self._lock = threading.Lock()
+        # Storage is allocated by reset() when the first take starts, keeping numpy off the startup path
+        self._data = None
+        self.total_written = 0
+        self.overflow_samples = 0
+
+    def reset(self):
+        """Starts a new take. Fresh storage keeps views returned for the previous take valid."""
+        with self._lock:
+            self._data = np.empty(self.capacity, dtype=np.float32)
+            self.total_written = 0
+            self.overflow_samples = 0
+
+    def write(self, block: np.ndarray):
+        n = len(block)
+        with self._lock:
+            cap = self.capacity
+            if n > cap:
+                block = block[-cap:]
+                self.total_written += n - cap  # skipped, counted as lost below
+                n = cap
+
+            start = self.total_written % cap
+            first = min(n, cap - start)
+            self._data[start:start + first] = block[:first]
+            self._data[:n - first] = block[first:]
+
+            self.total_written += n
+            self.overflow_samples = max(0, self.total_written - cap)
+
+    def snapshot(self) -> np.ndarray:
+        """The whole take: a view when nothing wrapped, otherwise one contiguous copy."""
+        with self._lock:
+            if self.total_written <= self.capacity:
+                return self._data[:self.total_written]
+            start = self.total_written % self.capacity
+            return np.concatenate((self._data[start:], self._data[:start]))
+
+    def read_since(self, pos: int) -> tuple[np.ndarray, int]:
+        """Copies the audio written after absolute position `pos`; returns it with the new position."""
+        with self._lock:
+            end = self.total_written
+            pos = max(pos, end - self.capacity)
+            if pos >= end:
+                return np.zeros(0, dtype=np.float32), end
+            a, b = pos % self.capacity, end % self.capacity
+            if a < b:
+                return self._data[a:b].copy(), end
+            return np.concatenate((self._data[a:], self._data[:b])), end
+
+class SpillBuffer:
+    """Append-only take in a memory-mapped float32 file, for recordings of any length.
+
+    Drop-in for AudioRingBuffer: nothing is overwritten, and resident memory
+    stays bounded because the pages are file-backed and written back by the
+    OS. write() runs in the audio callback, so it never touches the file: the
+    first LONG_FORM_GROW_S are mapped up front and a helper thread extends the
+    mapping once it is SPILL_GROW_AT full.
+    """
+
+    overflow_samples = 0
+
+    def __init__(self, path: str, sample_rate: int = 16000, grow_s: float = LONG_FORM_GROW_S):
+        self.path = path
+        self.grow = int(sample_rate * grow_s)
+        self._lock = threading.Lock()
+        self._map = None
+        self.capacity = 0
+        self.total_written = 0
+        self._grow_wanted = threading.Event()
+        self._closed = False
+        open(self.path, "wb").close()
+        self._extend(self.grow)
+        threading.Thread(target=self._grow_ahead, name="dictaria-spill-grow", daemon=True).start()
+
+    def reset(self):
+        with self._lock:
+            self.total_written = 0
+
+    def _extend(self, needed: int):
+        """Maps a larger file; the old mapping stays valid, both share the page cache."""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity += self.grow
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * 4)
+        new_map = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity,))
+        with self._lock:
+            if capacity > self.capacity:
+                self._map, self.capacity = new_map, capacity
+
+    def _grow_ahead(self):
+        while True:
+            self._grow_wanted.wait()
+            self._grow_wanted.clear()
+            if self._closed:
+                return
+            try:
+                self._extend(self.capacity + self.grow)
+            except Exception as e:
+                print(f"Could not extend the long-form file: {e}")
+
+    def write(self, block: np.ndarray):
+        with self._lock:
+            end = self.total_written + len(block)
+            if end > self.capacity:
+                # The helper fell behind (e.g. a stalled disk): keep the audio anyway, on this thread
+                self._lock.release()
+                try:
+                    self._extend(end)
+                finally:
+                    self._lock.acquire()
+            self._map[self.total_written:end] = block
+            self.total_written = end
+            if end > self.capacity * SPILL_GROW_AT:
+                self._grow_wanted.set()
+
+    def snapshot(self) -> np.ndarray:
+        """Read-only mapping of the take so far (nothing is loaded into memory).
+
+        No flush is needed: the mappings share the page cache with the writer.
+        """
+        with self._lock:
+            total = self.total_written
+        if not total:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(self.path, dtype=np.float32, mode="r", shape=(total,))
+
+    def read_since(self, pos: int) -> tuple[np.ndarray, int]:
+        with self._lock:
+            end = self.total_written
+            if pos >= end:
+                return np.zeros(0, dtype=np.float32), end
+            return np.array(self._map[pos:end]), end
+
+    def close(self):
+        """Flushes and cuts the preallocated tail so the file holds exactly the take."""
+        with self._lock:
+            mapping, self._map = self._map, None
+            total = self.total_written
+        self._closed = True
+        self._grow_wanted.set()
+        if mapping is not None:
+            mapping.flush()
+        with open(self.path, "r+b") as f:
+            f.truncate(total * 4)
+
+# --------------------
+# AUDIO SOURCES
+# --------------------
+# A source opens a stream that calls callback(indata, frames, time_info, status) with (frames, 1)
+# float32 blocks, like sd.InputStream; the recorder only talks to the returned stream's stop()/close().
+
+class SoundDeviceSource:
+    """The microphone, through PortAudio."""
+
+    _UNRESOLVED = object()
+
+    def __init__(self):
+        self._device = self._UNRESOLVED
+
+    def _input_device(self):
+        """Resolved once; device queries are slow, especially on macOS."""
+        if self._device is not self._UNRESOLVED:
+            return self._device
+        input_device = None
+        if IS_MAC and INTERNAL_MIC_HINT:
+            try:
+                devices = sd.query_devices()
+                hint_lower = INTERNAL_MIC_HINT.lower()
+                for idx, dev in enumerate(devices):
+                    if dev.get("max_input_channels", 0) > 0 and hint_lower in dev.get("name", "").lower():
+                        input_device = idx
+                        print(f"Using forced macOS input device: {dev['name']}")
+                        break
+            except Exception as e:
+                print(f"Device query warning: {e}")
+        self._device = input_device
+        return input_device
+
+    def open(self, sample_rate: int, callback):
+        """Opens and starts an input stream; a cached device that fails is re-resolved once."""
+        for attempt in range(2):
+            try:
+                stream = sd.InputStream(
+                    samplerate=sample_rate,
+                    channels=1,
+                    dtype="float32",
+                    callback=callback,
+                    device=self._input_device(),
+                )
+                stream.start()
+                return stream
+            except Exception:
+                if attempt or self._device is None:
+                    raise
+                self._device = self._UNRESOLVED  # e.g. the device was unplugged
+
+class ReplayStatus(NamedTuple):
+    input_overflow: bool = True
+
+class ReplaySource:
+    """Plays a clip (looped) into the recorder, for soak tests and machines without a microphone.
+
+    Blocks are delivered from a thread at `speed` times real time. When that
+    thread falls more than REPLAY_MAX_LAG_BLOCKS behind, e.g. because the
+    process is starved, the missed blocks are dropped and the next callback
+    reports an input overflow, as PortAudio does.
+    """
+
+    def __init__(self, audio: np.ndarray, block_size: int = REPLAY_BLOCK_SIZE, speed: float = 1.0):
+        self.audio = np.ascontiguousarray(audio, dtype=np.float32).reshape(-1)
+        self.block_size = block_size
+        self.speed = speed
+        self.position = 0
+        self.blocks_delivered = 0
+        self.blocks_dropped = 0
+
+    def open(self, sample_rate: int, callback) -> ReplayStream:
+        stream = ReplayStream(self, sample_rate, callback)
+        stream.start()
+        return stream
+
+    def next_block(self) -> np.ndarray:
+        idx = (self.position + np.arange(self.block_size)) % len(self.audio)
+        self.position = int(idx[-1] + 1) % len(self.audio)
+        return self.audio[idx].reshape(-1, 1)
+
+    def skip(self, blocks: int):
+        self.position = (self.position + blocks * self.block_size) % len(self.audio)
+        self.blocks_dropped += blocks
+
+class ReplayStream:
+    def __init__(self, source: ReplaySource, sample_rate: int, callback):
+        self.source = source
+        self.period = source.block_size / sample_rate / source.speed
+        self.callback = callback
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dictaria-replay", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self):
+        self.stop()
+
+    def _run(self):
+        due = time.perf_counter()
+        while not self._stopped.is_set():
+            status = None
+            behind = int((time.perf_counter() - due) / self.period)
+            if behind > REPLAY_MAX_LAG_BLOCKS:
+                self.source.skip(behind)
+                due += behind * self.period
+                status = ReplayStatus()
+            self.callback(self.source.next_block(), self.source.block_size, None, status)
+            self.source.blocks_delivered += 1
+            due += self.period
+            self._stopped.wait(max(0.0, due - time.perf_counter()))
 
 # --------------------
 # AUDIO RECORDER
 # --------------------
 class AudioRecorder:
-    def __init__(self, sample_rate: int = 16000):
+    """Records takes into a ring buffer.
+
+    In warm mode the input stream stays open between takes: the callback
+    keeps the last PREROLL_S in `preroll`, a take starts by switching the
+    callback over to `buffer`, and the pre-roll becomes the start of the
+    take, so the first syllable is not lost to device start-up.
+    """
+
+    def __init__(self, sample_rate: int = 16000, preroll_s: float = PREROLL_S, source: SoundDeviceSource | ReplaySource | None = None):
         self.sample_rate = sample_rate
-        self.queue = queue.Queue()
+        self.source = source or SoundDeviceSource()
+        self.ring = AudioRingBuffer(sample_rate)
+        self.buffer: AudioRingBuffer | SpillBuffer = self.ring  # the current take
+        self.preroll = AudioRingBuffer(sample_rate, preroll_s)
         self.stream = None
         self.is_recording = False
+        self.warm = False
+        self.last_active = time.monotonic()
+        # Guards which buffer the callback writes to, so no block falls between pre-roll and take
+        self._route_lock = threading.Lock()
+        self._stream_lock = threading.Lock()
+        # Diagnostics: PortAudio input overflows (xruns) reported to the callback
+        self.input_overflows = 0
+        self.last_stop_timings: Dict[str, float] = {}
+        self._drain_pos = 0
+        self._drain_lock = threading.Lock()
+
+    @property
+    def overflow_samples(self) -> int:
+        """Samples lost because the take outgrew the ring buffer."""
+        return self.buffer.overflow_samples
 
     def _callback(self, indata: np.ndarray, frames: int, time_info, status):
         if status:
+            if status.input_overflow:
+                self.input_overflows += 1
             print(f"Audio Status: {status}")
-        self.queue.put(indata.copy())
+        with self._route_lock:
+            (self.buffer if self.is_recording else self.preroll).write(indata[:, 0])
 
-    def start(self):
-        if self.is_recording:
-            return
-        
-        with self.queue.mutex:
-            self.queue.queue.clear()
-            
+    def _open_stream(self):
+        self.stream = self.source.open(self.sample_rate, self._callback)
+
+    def _close_stream(self):
         try:
-            input_device = None
-            if IS_MAC and INTERNAL_MIC_HINT:
-                try:
-                    devices = sd.query_devices()
-                    hint_lower = INTERNAL_MIC_HINT.lower()
-                    for idx, dev in enumerate(devices):
-                        if dev.get("max_input_channels", 0) > 0 and hint_lower in dev.get("name", "").lower():
-                            input_device = idx
-                            print(f"Using forced macOS input device: {dev['name']}")
-                            break
-                except Exception as e:
-                    print(f"Device query warning: {e}")
-
-            self.stream = sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=1,
-                dtype="float32",
-                callback=self._callback,
-                device=input_device,
-            )
-            self.stream.start()
-            self.is_recording = True
+            if self.stream:
+                self.stream.stop()
+                self.stream.close()
         except Exception as e:
-            print(f"Failed to start stream: {e}")
-            self.is_recording = False
-            raise e
+            print(f"Error closing stream: {e}")
+        self.stream = None
+
+    def set_warm(self, enabled: bool):
+        """Opens (or releases) the idle stream. Slow: call off the Tk thread."""
+        with self._stream_lock:
+            self.warm = enabled
+            self.last_active = time.monotonic()
+            if self.is_recording:
+                return  # applied when the current take stops
+            if enabled and self.stream is None:
+                self.preroll.reset()
+                self._open_stream()
+            elif not enabled:
+                self._close_stream()
+
+    def release_if_idle(self, idle_s: float) -> bool:
+        """Frees the microphone after `idle_s` without a take; the next take reopens it and stays warm."""
+        with self._stream_lock:
+            if not (self.warm and self.stream and not self.is_recording):
+                return False
+            if time.monotonic() - self.last_active < idle_s:
+                return False
+            self._close_stream()
+            return True
+
+    def start(self, buffer: SpillBuffer | None = None):
+        """Starts a take in the in-memory ring buffer, or in `buffer` (e.g. a SpillBuffer for long recordings)."""
+        if self.is_recording:
+            return
+
+        with self._drain_lock:
+            self._drain_pos = 0
+
+        with self._stream_lock:
+            if self.stream is not None:
+                # Warm: the stream is already running; the pre-roll becomes the start of the take
+                with self._route_lock:
+                    self.buffer = buffer or self.ring
+                    self.buffer.reset()
+                    self.buffer.write(self.preroll.snapshot())
+                    self.preroll.reset()
+                    self.is_recording = True
+                return
+
+            self.buffer = buffer or self.ring
+            self.buffer.reset()
+            self.preroll.reset()
+            try:
+                self.is_recording = True  # before the stream starts, so its first block lands in the take
+                self._open_stream()
+            except Exception as e:
+                print(f"Failed to start stream: {e}")
+                self.is_recording = False
+                raise e
 
     def stop(self) -> np.ndarray | None:
-        """Stops stream. WARNING: This can be slow, call off main thread."""
+        """Stops the take and returns it. WARNING: closing the stream can be slow, call off main thread."""
         if not self.is_recording:
             return None
 
-        self.is_recording = False
+        t0 = time.perf_counter()
+        with self._stream_lock:
+            with self._route_lock:
+                self.is_recording = False
+            self.last_active = time.monotonic()
+            if not self.warm:
+                self._close_stream()
+        t1 = time.perf_counter()
+
+        if self.buffer.overflow_samples:
+            print(f"Recording buffer overflow: {self.buffer.overflow_samples / self.sample_rate:.1f}s of audio lost")
+
+        audio = self.buffer.snapshot()
+        self.last_stop_timings = {"close_stream": t1 - t0, "snapshot": time.perf_counter() - t1}
+        if not len(audio):
+            return None
+        return audio
+
+    def drain(self) -> np.ndarray | None:
+        """Returns the audio captured since the last drain, without stopping the stream."""
+        with self._drain_lock:
+            audio, self._drain_pos = self.buffer.read_since(self._drain_pos)
+
+        if not len(audio):
+            return None
+        return audio
+
+# --------------------
+# STREAMING CHUNKER
+# --------------------
+class SilenceChunker:
+    """Accumulates live audio and cuts it into chunks at silence boundaries."""
+
+    FRAME_S = 0.03
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        min_chunk_s: float = STREAM_MIN_CHUNK_S,
+        max_chunk_s: float = STREAM_MAX_CHUNK_S,
+        silence_s: float = STREAM_SILENCE_S,
+        silence_rms: float = STREAM_SILENCE_RMS,
+    ):
+        self.frame = int(sample_rate * self.FRAME_S)
+        self.min_samples = int(sample_rate * min_chunk_s)
+        self.max_samples = int(sample_rate * max_chunk_s)
+        self.silence_frames = max(1, int(silence_s / self.FRAME_S))
+        self.silence_rms = silence_rms
+        self.buffer = np.zeros(0, dtype=np.float32)
+
+    def _frame_rms(self, audio: np.ndarray) -> np.ndarray:
+        n = len(audio) // self.frame
+        frames = audio[: n * self.frame].reshape(n, self.frame)
+        return np.sqrt(np.mean(frames ** 2, axis=1))
+
+    def _find_cut(self) -> int | None:
+        if len(self.buffer) < self.min_samples:
+            return None
+
+        rms = self._frame_rms(self.buffer)
+        silent = np.concatenate(([False], rms < self.silence_rms, [False]))
+        edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+        starts, ends = edges[::2], edges[1::2]
+
+        # Cut in the middle of the latest long-enough pause past the minimum length
+        cuts = ((starts + ends) // 2)[(ends - starts) >= self.silence_frames] * self.frame
+        cuts = cuts[cuts >= self.min_samples]
+        if len(cuts):
+            return int(cuts[-1])
+
+        # No pause found: force a cut at the quietest frame of the second half
+        if len(self.buffer) >= self.max_samples:
+            half = len(rms) // 2
+            return int((half + np.argmin(rms[half:])) * self.frame)
+        return None
+
+    def _is_silent(self, chunk: np.ndarray) -> bool:
+        return len(chunk) < self.frame or bool(np.all(self._frame_rms(chunk) < self.silence_rms))
+
+    def feed(self, audio: np.ndarray | None) -> List[np.ndarray]:
+        """Adds audio and returns every chunk that is now complete."""
+        if audio is not None and len(audio):
+            self.buffer = np.concatenate([self.buffer, audio.reshape(-1).astype(np.float32, copy=False)])
+
+        chunks = []
+        while (cut := self._find_cut()) is not None:
+            chunk, self.buffer = self.buffer[:cut], self.buffer[cut:]
+            if not self._is_silent(chunk):
+                chunks.append(chunk)
+        return chunks
+
+    def flush(self) -> np.ndarray | None:
+        """Returns the unfinished tail chunk, if it contains anything audible."""
+        chunk, self.buffer = self.buffer, np.zeros(0, dtype=np.float32)
+        if self._is_silent(chunk):
+            return None
+        return chunk
+
+# --------------------
+# VOICE ACTIVITY TRIMMING
+# --------------------
+class VadConfig(NamedTuple):
+    frame_s: float = 0.03
+    energy_margin_db: float = 9.0   # speech must be this far above the local noise floor
+    min_energy_db: float = -55.0    # never speech below this absolute level
+    zcr_noise: float = 0.35         # high zero-crossing frames (hiss) need twice the margin
+    floor_window_s: float = 5.0     # window of the rolling noise-floor estimate
+    floor_percentile: float = 10.0
+    floor_cap_db: float = 10.0      # local floor may not rise this far above the global one
+    floor_max_db: float = -42.0     # nor above this level, so all-speech clips stay intact
+    min_speech_s: float = 0.12      # shorter bursts are clicks, not speech
+    hangover_s: float = 0.2         # padding kept around speech
+    max_pause_s: float = 0.8        # internal pauses longer than this are collapsed...
+    keep_pause_s: float = 0.3       # ...down to this length
+
+class VadResult(NamedTuple):
+    audio: np.ndarray
+    speech_found: bool
+    input_s: float
+    kept_s: float
+
+    @property
+    def removed_s(self) -> float:
+        return self.input_s - self.kept_s
+
+VAD_CONFIG = VadConfig()
+
+class PerformanceSettings(NamedTuple):
+    """Decode settings kept in the config file. They can be changed while Dictaria runs."""
+    model_size: str = MODEL_SIZE
+    compute_type: str = ""  # "" = the calibrated hardware profile's
+    cpu_threads: int = 0    # 0 = the calibrated hardware profile's
+    beam_size: int = BEAM_SIZE
+    adaptive: bool = ADAPTIVE_DECODING
+    vad_enabled: bool = VAD_ENABLED
+    vad: VadConfig = VAD_CONFIG
+
+    def to_json(self) -> Dict:
+        return dict(self._asdict(), vad=self.vad._asdict())
+
+    @classmethod
+    def from_json(cls, data: Dict) -> PerformanceSettings:
+        """Missing keys keep their defaults, so hand-written entries can be partial. Bad values raise ValueError."""
+        defaults = cls()
+        fields = {k: type(getattr(defaults, k))(data[k]) for k in cls._fields if k != "vad" and k in data}
+        vad = {k: float(v) for k, v in (data.get("vad") or {}).items() if k in VadConfig._fields}
+        settings = cls(**fields, vad=VAD_CONFIG._replace(**vad))
+        if settings.beam_size < 1 or settings.cpu_threads < 0:
+            raise ValueError(f"invalid beam_size/cpu_threads in {data}")
+        return settings
+
+    def model_key(self) -> tuple:
+        """The fields that need a model reload when they change."""
+        return (self.model_size, self.compute_type, self.cpu_threads)
+
+    def load_kwargs(self, profile: HardwareProfile) -> Dict:
+        kwargs = profile.load_kwargs()
+        if self.compute_type:
+            kwargs["compute_type"] = self.compute_type
+        if self.cpu_threads:
+            kwargs["cpu_threads"] = self.cpu_threads
+        return kwargs
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) indices of the True runs in a boolean array."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).astype(np.int8)))
+    return edges[::2], edges[1::2]
+
+def detect_speech_frames(audio: np.ndarray, sample_rate: int, cfg: VadConfig = VAD_CONFIG) -> np.ndarray:
+    """Per-frame speech mask from frame energy, zero-crossing rate and an adaptive noise floor."""
+    frame = int(sample_rate * cfg.frame_s)
+    n = len(audio) // frame
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    frames = audio[: n * frame].reshape(n, frame)
+
+    energy_db = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+    zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+
+    # Rolling low percentile tracks a drifting noise floor; capping it against the
+    # global estimate stops long stretches of continuous speech from raising it.
+    global_floor = np.percentile(energy_db, cfg.floor_percentile)
+    win = max(1, min(n, int(cfg.floor_window_s / cfg.frame_s)))
+    padded = np.pad(energy_db, (win // 2, win - 1 - win // 2), mode="edge")
+    local_floor = np.percentile(np.lib.stride_tricks.sliding_window_view(padded, win), cfg.floor_percentile, axis=1)
+    floor = np.minimum(np.minimum(local_floor, global_floor + cfg.floor_cap_db), cfg.floor_max_db)
+
+    margin = np.where(zcr > cfg.zcr_noise, 2 * cfg.energy_margin_db, cfg.energy_margin_db)
+    speech = (energy_db > floor + margin) & (energy_db > cfg.min_energy_db)
+
+    starts, ends = _runs(speech)
+    for a, b in zip(starts, ends):
+        if b - a < int(cfg.min_speech_s / cfg.frame_s):
+            speech[a:b] = False
+
+    hang = int(cfg.hangover_s / cfg.frame_s)
+    if hang and speech.any():
+        speech = np.convolve(speech, np.ones(2 * hang + 1), mode="same") > 0
+    return speech
+
+def trim_silence(audio: np.ndarray, sample_rate: int, cfg: VadConfig = VAD_CONFIG) -> VadResult:
+    """Drops leading/trailing silence and shortens long internal pauses."""
+    audio = audio.reshape(-1)
+    input_s = len(audio) / sample_rate
+    speech = detect_speech_frames(audio, sample_rate, cfg)
+    if not speech.any():
+        return VadResult(audio[:0], False, input_s, 0.0)
+
+    keep = speech.copy()
+    first, last = np.flatnonzero(speech)[[0, -1]]
+    max_pause = int(cfg.max_pause_s / cfg.frame_s)
+    half_keep = int(cfg.keep_pause_s / cfg.frame_s) // 2
+    starts, ends = _runs(~speech)
+    for a, b in zip(starts, ends):
+        if a > first and b <= last:
+            keep[a:b] = (b - a) <= max_pause
+            if (b - a) > max_pause:
+                keep[a:a + half_keep] = True
+                keep[b - half_keep:b] = True
+
+    frame = int(sample_rate * cfg.frame_s)
+    mask = np.repeat(keep, frame)
+    if keep[-1]:
+        mask = np.concatenate((mask, np.ones(len(audio) - len(mask), dtype=bool)))
+    else:
+        mask = np.concatenate((mask, np.zeros(len(audio) - len(mask), dtype=bool)))
+    trimmed = audio[mask]
+    return VadResult(trimmed, True, input_s, len(trimmed) / sample_rate)
+
+# --------------------
+# DEBUG EXPORT
+# --------------------
+def export_debug_wav(audio: np.ndarray, directory: str):
+    """Writes a clip to `directory` for debugging. Never raises: export must not break transcription."""
+    try:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("dictaria_%Y%m%d_%H%M%S_") + f"{time.time_ns() % 1_000_000_000:09d}.wav")
+        sf.write(path, audio, SAMPLE_RATE)
+        print(f"Debug WAV written: {path}")
+    except Exception as e:
+        print(f"Debug WAV export failed: {e}")
+
+# --------------------
+# LATENCY METRICS
+# --------------------
+class TakeMetrics:
+    """Timing spans for one take, from the stop press to the text on screen.
+
+    A span costs two perf_counter() calls, so this stays on in production.
+    Spans with the same name accumulate (e.g. one decode per streamed chunk).
+    """
+
+    def __init__(self, mode: str, language: str):
+        self.t0 = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.fields: Dict[str, object] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mode": mode,
+            "language": language,
+        }
+
+    def restart_clock(self):
+        """For streaming takes: latency is counted from the stop press, not from the start."""
+        self.t0 = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def mark(self, name: str):
+        """Records the time elapsed since the stop press under `name`."""
+        self.fields[name] = round(time.perf_counter() - self.t0, 4)
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def count(self, name: str, key: str, n: int = 1):
+        """Tallies `key` in the dict field `name`, e.g. which decode path each clip took."""
+        tally = self.fields.setdefault(name, {})
+        tally[key] = tally.get(key, 0) + n
+
+    def finish(self) -> dict:
+        record = dict(self.fields)
+        record["stages"] = {k: round(v, 4) for k, v in self.stages.items()}
+        record["total_s"] = round(time.perf_counter() - self.t0, 4)
+        decode_s = sum(v for k, v in self.stages.items() if k.endswith("decode"))
+        record["decode_s"] = round(decode_s, 4)
+        audio_s = record.get("audio_s")
+        if audio_s:
+            record["rtf"] = round(decode_s / audio_s, 4)
+        return record
+
+def format_take_metrics(record: dict) -> str:
+    stages = ", ".join(
+        f"{name} {sec * 1000:.0f}ms" if sec < 1 else f"{name} {sec:.2f}s"
+        for name, sec in record["stages"].items()
+    )
+    rtf = f" (RTF {record['rtf']:.2f})" if "rtf" in record else ""
+    paths = ", ".join(path if n == 1 else f"{path} ×{n}" for path, n in record.get("decode_paths", {}).items())
+    paths = f" | {paths}" if paths else ""
+    return f"[⏱ {record.get('audio_s', 0):.1f}s audio{rtf}{paths} | {stages} | total {record['total_s']:.2f}s]"
+
+class MetricsLog:
+    """Appends one JSON line per take to a size-rotated log file."""
+
+    def __init__(self, path: str = METRICS_LOG_PATH):
+        self.logger = logging.getLogger("dictaria.metrics")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=METRICS_LOG_MAX_BYTES, backupCount=METRICS_LOG_BACKUPS, encoding="utf-8", delay=True
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+
+    def write(self, record: dict):
+        try:
+            self.logger.info(json.dumps(record, ensure_ascii=False))
+        except Exception as e:
+            print(f"Metrics log error: {e}")
+
+# --------------------
+# TRANSCRIPT HISTORY
+# --------------------
+class HistoryEntry(NamedTuple):
+    id: int
+    ts: float
+    language: str
+    mode: str
+    text: str
+    audio_s: float | None
+    decode_s: float | None
+
+    def label(self) -> str:
+        return f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(self.ts))} · {self.language}"
+
+class TranscriptStore:
+    """Append-only SQLite store of every transcript with its take metrics.
+
+    One connection is shared by the executor threads, serialized by a lock.
+    """
+
+    def __init__(self, path: str = HISTORY_DB_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS transcripts ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, language TEXT, mode TEXT,"
+                " text TEXT NOT NULL, audio_s REAL, decode_s REAL, metrics TEXT)"
+            )
+
+    def add(self, text: str, record: dict) -> int:
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO transcripts (ts, language, mode, text, audio_s, decode_s, metrics) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), record.get("language"), record.get("mode"), text,
+                 record.get("audio_s"), record.get("decode_s"), json.dumps(record, ensure_ascii=False)),
+            )
+            return cursor.lastrowid
+
+    def _select(self, where: str, params: tuple, limit: int) -> List[HistoryEntry]:
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id, ts, language, mode, text, audio_s, decode_s FROM transcripts {where} ORDER BY id DESC LIMIT ?",
+                params + (limit,),
+            ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def before(self, entry_id: int | None, limit: int = HISTORY_PAGE_ENTRIES) -> List[HistoryEntry]:
+        """The `limit` entries preceding `entry_id` (or the newest ones), oldest first."""
+        if entry_id is None:
+            return self._select("", (), limit)[::-1]
+        return self._select("WHERE id < ?", (entry_id,), limit)[::-1]
+
+    def search(self, query: str, limit: int = HISTORY_SEARCH_LIMIT) -> List[HistoryEntry]:
+        """Newest first; case-insensitive substring match over the full history."""
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self._select("WHERE text LIKE ? ESCAPE '\\'", (pattern,), limit)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+# --------------------
+# LONG-FORM RECORDINGS
+# --------------------
+class LongFormSession:
+    """One long recording on disk: the spilled audio plus a checkpoint of the windows decoded so far.
+
+    The checkpoint is rewritten after every window, so an interrupted decode
+    (or a crash while recording) resumes from the last finished window.
+    """
+
+    AUDIO_FILE = "audio.f32"
+    CHECKPOINT_FILE = "checkpoint.json"
+
+    def __init__(self, directory: str, state: dict):
+        self.directory = directory
+        self.state = state
+        self.audio_path = os.path.join(directory, self.AUDIO_FILE)
+
+    @classmethod
+    def create(cls, language: str, root: str = LONG_FORM_DIR) -> LongFormSession:
+        os.makedirs(root, exist_ok=True)
+        # Unique even for two takes started within the same second; the time prefix keeps them in order
+        directory = tempfile.mkdtemp(prefix=time.strftime("%Y%m%d-%H%M%S-"), dir=root)
+        session = cls(directory, {
+            "created": time.time(),
+            "language": language,
+            "sample_rate": SAMPLE_RATE,
+            "samples": None,  # set when recording stops
+            "window_s": LONG_FORM_WINDOW_S,
+            "overlap_s": LONG_FORM_OVERLAP_S,
+            "next_window": 0,
+            "segments": [],
+        })
+        session.save()
+        return session
+
+    @classmethod
+    def find_unfinished(cls, root: str = LONG_FORM_DIR) -> List[LongFormSession]:
+        sessions = []
+        if not os.path.isdir(root):
+            return sessions
+        for name in sorted(os.listdir(root)):
+            directory = os.path.join(root, name)
+            try:
+                with open(os.path.join(directory, cls.CHECKPOINT_FILE), "r") as f:
+                    sessions.append(cls(directory, json.load(f)))
+            except (OSError, ValueError) as e:
+                print(f"Skipping long recording {directory}: {e}")
+        return sessions
+
+    def save(self):
+        path = os.path.join(self.directory, self.CHECKPOINT_FILE)
+        with open(path + ".part", "w") as f:
+            json.dump(self.state, f)
+        os.replace(path + ".part", path)
+
+    def finish_recording(self, samples: int):
+        self.state["samples"] = samples
+        self.save()
+
+    def _recorded_samples(self) -> int:
+        """After a crash mid-recording: where the audio ends in the file, before the zeros it was extended with."""
+        data = np.memmap(self.audio_path, dtype=np.float32, mode="r") if os.path.getsize(self.audio_path) >= 4 else np.zeros(0, dtype=np.float32)
+        block = SAMPLE_RATE * 60
+        end = len(data)
+        while end > 0:
+            nonzero = np.flatnonzero(data[max(0, end - block):end])
+            if len(nonzero):
+                return max(0, end - block) + int(nonzero[-1]) + 1
+            end -= block
+        return 0
+
+    def audio(self) -> np.ndarray:
+        """The recording, memory-mapped. After a crash mid-recording, everything that reached the file."""
+        samples = self.state["samples"]
+        if samples is None:
+            samples = self._recorded_samples()
+        if not samples:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(self.audio_path, dtype=np.float32, mode="r", shape=(samples,))
+
+    def windows(self, total: int) -> List[tuple[int, int]]:
+        rate = self.state["sample_rate"]
+        size, overlap = int(self.state["window_s"] * rate), int(self.state["overlap_s"] * rate)
+        if total <= size:
+            return [(0, total)]
+        step = size - overlap
+        count = math.ceil((total - overlap) / step)
+        return [(i * step, min(i * step + size, total)) for i in range(count)]
+
+    def transcribe(self, decode, progress=None) -> str:
+        """Decodes the remaining windows with `decode(audio) -> segments` and returns the full text.
+
+        Each window keeps only the segments whose midpoint falls in its own
+        share of the overlaps, so words at window edges appear exactly once.
+        """
+        audio = self.audio()
+        rate = self.state["sample_rate"]
+        windows = self.windows(len(audio))
+        half_overlap = self.state["overlap_s"] / 2
+        for i in range(self.state["next_window"], len(windows)):
+            start, end = windows[i]
+            if progress:
+                progress(i + 1, len(windows))
+            chunk = np.array(audio[start:end])  # only this window is read into memory
+            if np.sqrt(np.mean(chunk ** 2)) >= STREAM_SILENCE_RMS / 4:
+                offset = start / rate
+                lo = offset + half_overlap if i > 0 else 0.0
+                hi = end / rate - half_overlap if i < len(windows) - 1 else float("inf")
+                for seg in decode(chunk):
+                    mid = offset + (seg.start + seg.end) / 2
+                    if lo <= mid < hi and seg.text.strip():
+                        self.state["segments"].append([round(offset + seg.start, 2), round(offset + seg.end, 2), seg.text.strip()])
+            self.state["next_window"] = i + 1
+            self.save()
+        return self.text()
+
+    def text(self) -> str:
+        return " ".join(seg[2] for seg in self.state["segments"]).strip()
+
+    def remove(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+# --------------------
+# TAKE CACHE
+# --------------------
+class CachedTake:
+    """Audio of a recent take (int16, half the size of float32) plus front-end results per model."""
+
+    def __init__(self, seq: int, audio: np.ndarray, language: str, trimmed: bool):
+        self.seq = seq
+        self.pcm = (np.clip(audio.reshape(-1), -1.0, 1.0) * 32767).astype(np.int16)
+        self.language = language
+        self.trimmed = trimmed  # False: VAD has not run yet (streaming takes)
+        # model -> (features, encoder output of the first 30 s window); dropped with the model
+        self.front_end: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def audio(self) -> np.ndarray:
+        return self.pcm.astype(np.float32) / 32767
+
+    def replace_audio(self, audio: np.ndarray):
+        self.pcm = (np.clip(audio.reshape(-1), -1.0, 1.0) * 32767).astype(np.int16)
+        self.trimmed = True
+        self.front_end.clear()
+
+class TakeCache:
+    def __init__(self, size: int = TAKE_CACHE_SIZE):
+        self.size = size
+        self._takes: OrderedDict[int, CachedTake] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, seq: int, audio: np.ndarray, language: str, trimmed: bool = True):
+        cached = CachedTake(seq, audio, language, trimmed)
+        with self._lock:
+            self._takes[seq] = cached
+            while len(self._takes) > self.size:
+                self._takes.popitem(last=False)
+
+    def latest(self) -> CachedTake | None:
+        with self._lock:
+            return next(reversed(self._takes.values()), None)
+
+    def get(self, seq: int) -> CachedTake | None:
+        with self._lock:
+            return self._takes.get(seq)
+
+    def recent(self) -> List[CachedTake]:
+        """Cached takes, newest first."""
+        with self._lock:
+            return list(reversed(self._takes.values()))
+
+class OnDemandModel:
+    """A model of another size, loaded for re-transcription.
+
+    Takes queued for it hold it with acquire()/release(). Once retired
+    (replaced, or idle too long) it is closed as soon as no take holds it.
+    """
+
+    def __init__(self, size: str, model):
+        self.size = size
+        self.model = model
+        self.users = 0
+        self.last_used = time.monotonic()
+        self.retired = False
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            self.users += 1
+
+    def release(self):
+        with self._lock:
+            self.users -= 1
+            self.last_used = time.monotonic()
+            close = self.retired and not self.users
+        if close:
+            self._close()
+
+    def retire(self):
+        with self._lock:
+            self.retired = True
+            close = not self.users
+        if close:
+            self._close()
+
+    def _close(self):
+        if isinstance(self.model, ProcessWhisperModel):
+            self.model.close()
+        self.model = None  # an in-process model is freed with this last reference
+
+_options_templates: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+def _transcription_options(model, beam_size: int):
+    """The options model.transcribe() would build for this app, with another beam size.
+
+    faster-whisper builds them inside transcribe(), so they are taken once per
+    model from a transcribe() call on a few samples whose segments are never
+    iterated (no decoding happens).
+    """
+    if model not in _options_templates:
+        _, info = model.transcribe(np.zeros(SAMPLE_RATE // 10, dtype=np.float32), language=LANG_CODES[0],
+                                   beam_size=BEAM_SIZE, condition_on_previous_text=False)
+        _options_templates[model] = info.transcription_options
+    return dataclasses.replace(_options_templates[model], beam_size=beam_size, best_of=max(beam_size, 5))
+
+def decode_cached_take(model, cached: CachedTake, language: str, beam_size: int, metrics: TakeMetrics) -> list:
+    """Decodes a cached take, reusing its mel features and first-window encoder output for this model.
+
+    Only the decoder runs again when just the language or beam size changes.
+    Models without the local faster-whisper internals (the engine daemon)
+    get a plain transcribe().
+    """
+    if isinstance(model, ProcessWhisperModel):
+        return model.decode_cached(cached, language, beam_size, metrics)
+    if not isinstance(model, faster_whisper.WhisperModel):
+        with metrics.span("decode"):
+            segments, _ = model.transcribe(cached.audio(), language=language, beam_size=beam_size, condition_on_previous_text=False)
+            return list(segments)
+
+    if model not in cached.front_end:
+        with metrics.span("features"):
+            features = model.feature_extractor(cached.audio())
+        with metrics.span("encode"):
+            # Same first window generate_segments() would encode itself
+            first = features[:, : min(model.feature_extractor.nb_max_frames, features.shape[-1] - 1)]
+            encoder_output = model.encode(faster_whisper.audio.pad_or_trim(first))
+        cached.front_end[model] = (features, encoder_output)
+    features, encoder_output = cached.front_end[model]
+
+    if not model.model.is_multilingual:
+        language = "en"
+    tokenizer = faster_whisper.tokenizer.Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=language)
+    options = _transcription_options(model, beam_size)
+    with metrics.span("decode"):
+        return list(model.generate_segments(features, tokenizer, options, False, encoder_output))
+
+# --------------------
+# TAKE PIPELINE
+# --------------------
+class Take:
+    """One recording from start to delivered text."""
+
+    def __init__(self, seq: int, language: str | None, metrics: TakeMetrics, streaming: bool = False):
+        self.seq = seq
+        self.language = language  # None until an "Auto" take's language is detected
+        self.detect_lock = threading.Lock()
+        self.metrics = metrics
+        self.streaming = streaming
+        self.started = False    # the worker has begun on this take
+        self.cancelled = False  # remaining jobs are skipped
+        self.texts: List[str] = []
+        self.chunker: SilenceChunker | None = None
+        self.stopped = threading.Event()
+        self.queued_at = 0.0
+        self.long_form: LongFormSession | None = None
+        self.poller: concurrent.futures.Future | None = None
+
+    @property
+    def tag(self) -> str:
+        """Text-box tag covering this take's transcript."""
+        return f"take{self.seq}"
+
+class TakePipeline:
+    """Ordered work queue served by a single transcription worker thread.
+
+    Jobs run strictly in submission order, so results come out in take order
+    while the next take is already recording. Capacity is counted in takes, not
+    jobs: the streamed chunks and follow-up passes of one take never block.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_TAKES, policy: str = QUEUE_FULL_POLICY, on_change=None, on_dropped=None):
+        self.max_pending = max_pending
+        self.policy = policy
+        self.on_change = on_change      # called with the number of open takes
+        self.on_dropped = on_dropped    # called with a Take discarded by "drop_oldest"
+        self._jobs: queue.Queue = queue.Queue()
+        self._takes: deque[Take] = deque()
+        self._lock = threading.Lock()
+        self.running: Take | None = None  # the take whose job is on the worker right now
+        self._worker = threading.Thread(target=self._run, name="dictaria-transcriber", daemon=True)
+        self._worker.start()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._takes)
+
+    def open_take(self, take: Take) -> bool:
+        """Reserves room for a new take, applying the queue-full policy. False means refused."""
+        dropped = None
+        with self._lock:
+            if len(self._takes) >= self.max_pending:
+                waiting = [t for t in self._takes if not t.started and t.stopped.is_set()]
+                if self.policy != "drop_oldest" or not waiting:
+                    return False
+                dropped = waiting[0]
+                dropped.cancelled = True
+                self._takes.remove(dropped)
+            self._takes.append(take)
+        if dropped is not None and self.on_dropped:
+            self.on_dropped(dropped)
+        self._notify()
+        return True
+
+    def submit(self, take: Take, fn, *args):
+        self._jobs.put((take, fn, args))
+
+    def finish_take(self, take: Take):
+        with self._lock:
+            if take in self._takes:
+                self._takes.remove(take)
+        self._notify()
+
+    def shutdown(self):
+        self._jobs.put(None)
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change(self.pending)
+
+    def _run(self):
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                return
+            take, fn, args = item
+            if take.cancelled:
+                continue
+            take.started = True
+            self.running = take
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Transcription job failed: {e}")
+            finally:
+                self.running = None
+
+# --------------------
+# MODEL LOADING
+# --------------------
+def load_whisper_model(
+    model_size: str = MODEL_SIZE,
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+    device: str = DEVICE,
+    compute_type: str = COMPUTE_TYPE,
+) -> faster_whisper.WhisperModel:
+    """The single place a WhisperModel is constructed: app, daemon, batch workers and benchmarks."""
+    print(f"Loading Model {model_size} on {device} ({compute_type})...")
+    return faster_whisper.WhisperModel(
+        model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads, num_workers=num_workers
+    )
+
+def synth_speech(seconds: float, sample_rate: int = SAMPLE_RATE, seed: int = 0) -> np.ndarray:
+    """Deterministic speech-like fixture: voiced syllables with a moving pitch and formants, separated by short pauses.
+
+    Used for offline benchmarks and calibration where no recording is available.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+
+    # Syllables at ~4 Hz, grouped into words with pauses in between
+    syllable = np.clip(np.sin(np.pi * 4.0 * t) ** 2, 0, 1)
+    words = (np.sin(2 * np.pi * 0.35 * t + rng.uniform(0, np.pi)) > -0.6).astype(np.float32)
+    envelope = np.convolve(syllable * words, np.ones(160) / 160, mode="same")
+
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.5 * t) + 15 * np.sin(2 * np.pi * 3.1 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    formant1 = 500 + 250 * np.sin(2 * np.pi * 2.0 * t + 1.0)
+    formant2 = 1500 + 600 * np.sin(2 * np.pi * 1.3 * t)
+
+    voiced = np.zeros(n)
+    for k in range(1, 30):
+        freq = k * pitch
+        gain = np.exp(-((freq - formant1) / 150) ** 2) + 0.5 * np.exp(-((freq - formant2) / 250) ** 2) + 0.02
+        voiced += gain * np.sin(k * phase)
+
+    audio = 0.3 * envelope * voiced / np.max(np.abs(voiced)) + 0.002 * rng.standard_normal(n)
+    return audio.astype(np.float32)
+
+# --------------------
+# ADAPTIVE DECODING
+# --------------------
+def is_low_confidence(segment) -> bool:
+    return segment.avg_logprob < ADAPTIVE_MIN_AVG_LOGPROB or segment.compression_ratio > ADAPTIVE_MAX_COMPRESSION_RATIO
+
+def is_better_decode(new: list, old) -> bool:
+    """Whether the beam's segments should replace a weak greedy one: only when there are some and they are more confident."""
+    if not new:
+        return False
+    if old.compression_ratio > ADAPTIVE_MAX_COMPRESSION_RATIO and all(s.compression_ratio <= ADAPTIVE_MAX_COMPRESSION_RATIO for s in new):
+        return True  # the greedy pass looped, the beam did not
+    duration = sum(max(s.end - s.start, 1e-3) for s in new)
+    return sum(s.avg_logprob * max(s.end - s.start, 1e-3) for s in new) / duration > old.avg_logprob
+
+def _shifted(segment, offset: float):
+    """The segment with its times moved by `offset` seconds; works for Segment and the remote models' namespaces."""
+    if dataclasses.is_dataclass(segment):
+        return dataclasses.replace(segment, start=segment.start + offset, end=segment.end + offset)
+    return SimpleNamespace(**dict(vars(segment), start=segment.start + offset, end=segment.end + offset))
+
+def decode_adaptive(model, audio: np.ndarray, language: str, beam_size: int, metrics: TakeMetrics, stage: str = "decode", adaptive: bool = True) -> list:
+    """Decodes one clip, greedily first when it is short.
+
+    Greedy segments that look unreliable (low avg_logprob or a high
+    compression ratio, i.e. repetition) are cut out with a little context and
+    decoded again with the full beam; the beam's text is kept only when it is
+    more confident. Long clips use the beam directly. The path taken is
+    tallied in the take's "decode_paths".
+    """
+    def decode(clip: np.ndarray, beam: int) -> list:
+        segments, _ = model.transcribe(clip, language=language, beam_size=beam, condition_on_previous_text=False)
+        return list(segments)  # decoding happens while iterating
+
+    if not adaptive or beam_size <= 1 or len(audio) > ADAPTIVE_MAX_CLIP_S * SAMPLE_RATE:
+        with metrics.span(stage):
+            segments = decode(audio, beam_size)
+        metrics.count("decode_paths", "greedy" if beam_size <= 1 else "beam")
+        return segments
+
+    with metrics.span(stage):
+        segments = decode(audio, 1)
+    weak = [i for i, seg in enumerate(segments) if is_low_confidence(seg)]
+    if not weak:
+        metrics.count("decode_paths", "greedy")
+        return segments
+
+    pad = int(ADAPTIVE_PAD_S * SAMPLE_RATE)
+    result = []
+    replaced = 0
+    with metrics.span("redecode"):
+        for i, seg in enumerate(segments):
+            if i not in weak:
+                result.append(seg)
+                continue
+            # Padded, but never into a neighbouring segment, whose words would come out twice
+            lo = segments[i - 1].end if i > 0 else 0.0
+            hi = segments[i + 1].start if i + 1 < len(segments) else len(audio) / SAMPLE_RATE
+            start = max(int(lo * SAMPLE_RATE), int(seg.start * SAMPLE_RATE) - pad, 0)
+            end = min(int(hi * SAMPLE_RATE), int(seg.end * SAMPLE_RATE) + pad, len(audio))
+            if end <= start:
+                result.append(seg)
+                continue
+            redecoded = decode(audio[start:end], beam_size)
+            if is_better_decode(redecoded, seg):
+                result.extend(_shifted(s, start / SAMPLE_RATE) for s in redecoded)
+                replaced += 1
+            else:
+                result.append(seg)
+    metrics.count("decode_paths", "greedy+beam")
+    metrics.set(
+        redecoded_segments=metrics.fields.get("redecoded_segments", 0) + len(weak),
+        replaced_segments=metrics.fields.get("replaced_segments", 0) + replaced,
+    )
+    return result
+
+# --------------------
+# LANGUAGE DETECTION
+# --------------------
+def detect_language_among(model, audio: np.ndarray, codes: List[str] = LANG_CODES) -> tuple[str, float]:
+    """Whisper's language detection limited to `codes`, with the probability renormalized over them."""
+    _, _, all_probs = model.detect_language(audio=np.ascontiguousarray(audio.reshape(-1), dtype=np.float32))
+    probs = {code: p for code, p in all_probs if code in codes}
+    total = sum(probs.values())
+    if not total:
+        return codes[0], 0.0
+    code = max(probs, key=probs.get)
+    return code, probs[code] / total
+
+# --------------------
+# HARDWARE CALIBRATION
+# --------------------
+def _time_decode(model, audio: np.ndarray, parallel: int) -> float:
+    """Seconds per clip with `parallel` concurrent decodes (plain latency when parallel is 1)."""
+    def decode(_):
+        segments, _ = model.transcribe(audio, language=LANG_CODES[0], beam_size=BEAM_SIZE, condition_on_previous_text=False)
+        for _ in segments:  # decoding happens lazily while iterating
+            pass
+
+    timings = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as pool:
+        for _ in range(TUNE_REPEATS):
+            start = time.perf_counter()
+            list(pool.map(decode, range(parallel)))
+            timings.append((time.perf_counter() - start) / parallel)
+    return float(np.median(timings))
+
+def tune_hardware(model_size: str = MODEL_SIZE, device: str = DEVICE, workers: List[int] | None = None, log=print) -> HardwareProfile:
+    """Times a fixed decode across backend settings and returns the fastest profile.
+
+    Rather than the full compute type x threads x workers grid, each dimension
+    is swept in turn with the best value found so far, which needs a handful
+    of model loads instead of dozens. Extra workers only help concurrent
+    callers (the daemon), so they are scored per clip under that much load.
+    """
+    cores = os.cpu_count() or 1
+    supported = ctranslate2.get_supported_compute_types(device)
+    compute_types = [c for c in TUNE_COMPUTE_TYPES if c in supported] or [COMPUTE_TYPE]
+    # cpu_threads only matters on CPU; 0 leaves the choice to CTranslate2 elsewhere
+    thread_counts = sorted({cores, max(1, cores // 2), max(1, cores // 4)}, reverse=True) if device == "cpu" else [0]
+    audio = synth_speech(TUNE_CLIP_S, seed=1)
+    results: Dict[tuple, float] = {}
+
+    def measure(compute_type: str, cpu_threads: int, num_workers: int) -> float:
+        key = (compute_type, cpu_threads, num_workers)
+        if key not in results:
+            try:
+                model = load_whisper_model(model_size, cpu_threads=cpu_threads, num_workers=num_workers, device=device, compute_type=compute_type)
+                _time_decode(model, audio[: SAMPLE_RATE], 1)  # warm-up
+                results[key] = _time_decode(model, audio, num_workers)
+                del model
+            except Exception as e:  # e.g. a compute type the model cannot be converted to
+                log(f"  {compute_type:<14} threads={cpu_threads:<3} workers={num_workers}: failed ({e})")
+                results[key] = float("inf")
+            else:
+                log(f"  {compute_type:<14} threads={cpu_threads:<3} workers={num_workers}: {results[key]:.2f}s")
+        return results[key]
+
+    log(f"Calibrating {model_size} on {device}: {cores} cores, compute types {', '.join(compute_types)}")
+    best_type = min(compute_types, key=lambda c: measure(c, thread_counts[0], 1))
+    best_threads = min(thread_counts, key=lambda t: measure(best_type, t, 1))
+    best_workers = min(workers or [1], key=lambda w: measure(best_type, best_threads, w))
+    decode_s = results[(best_type, best_threads, best_workers)]
+    if decode_s == float("inf"):
+        raise RuntimeError("no backend configuration could be loaded")
+
+    return HardwareProfile(device, best_type, best_threads, best_workers, round(decode_s, 3), model_size, machine_fingerprint())
+
+def run_tune(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="dictaria.py tune", description="Re-run the hardware calibration and save the fastest profile.")
+    parser.add_argument("--model", default=MODEL_SIZE, help="Model to calibrate with")
+    parser.add_argument("--workers", type=lambda v: [int(w) for w in v.split(",") if w], default=[1],
+                        help="num_workers values to try, e.g. 1,2 on a machine serving the engine daemon")
+    args = parser.parse_args(argv)
+
+    config = ConfigManager(CONFIG_PATH, LANG_CODES[0])
+    profile = tune_hardware(args.model, DEVICE, args.workers)
+    config.hardware_profile = profile
+    config.save()
+    config.flush()
+    print(f"Saved to {CONFIG_PATH}: {profile.compute_type}, cpu_threads={profile.cpu_threads}, "
+          f"num_workers={profile.num_workers} ({profile.decode_s:.2f}s per {TUNE_CLIP_S:.0f}s clip)")
+
+def saved_load_kwargs() -> Dict:
+    """Backend settings for processes without a ConfigManager of their own: the calibrated profile, if any."""
+    config = ConfigManager(CONFIG_PATH, LANG_CODES[0])
+    profile = config.hardware_profile
+    return config.performance.load_kwargs(profile) if profile and profile.applies_here() else {}
+
+# --------------------
+# ENGINE DAEMON & CLIENT
+# --------------------
+# Wire format: 4-byte big-endian header length, JSON header, then header["payload"] raw bytes.
+
+class EngineUnavailable(ConnectionError):
+    pass
+
+def runtime_dir() -> str:
+    """Per-user directory for sockets, private to the user."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    path = os.path.join(base, "dictaria") if base else os.path.join(tempfile.gettempdir(), f"dictaria-{getpass.getuser()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        # A shared /tmp lets anyone create dictaria-<user> first: only trust a private directory we own
+        st = os.lstat(path)
+        if stat.S_ISLNK(st.st_mode) or not stat.S_ISDIR(st.st_mode):
+            raise RuntimeError(f"{path} is not a directory")
+        if st.st_uid != os.getuid():
+            raise RuntimeError(f"{path} is owned by another user")
+        if st.st_mode & 0o077:
+            raise RuntimeError(f"{path} is accessible by other users (mode {stat.S_IMODE(st.st_mode):o})")
+    return path
+
+def engine_socket_path() -> str:
+    return os.path.join(runtime_dir(), ENGINE_SOCKET_NAME)
+
+def claim_unix_socket(path: str, owner: str):
+    """Removes a stale socket left by a dead process; raises if a live one is still listening."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise RuntimeError(f"{owner} is already listening on {path}")
+    finally:
+        probe.close()
+
+def bind_unix_socket(sock: socket.socket, path: str):
+    """Binds with a restrictive umask, so the socket is never reachable by others, even briefly."""
+    old_umask = os.umask(0o077)
+    try:
+        sock.bind(path)
+    finally:
+        os.umask(old_umask)
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        r = sock.recv_into(view[got:])
+        if r == 0:
+            raise EngineUnavailable("Engine connection closed")
+        got += r
+    return bytes(buf)
+
+def send_message(sock: socket.socket, header: dict, payload: bytes = b""):
+    header = dict(header, payload=len(payload))
+    raw = json.dumps(header).encode("utf-8")
+    sock.sendall(struct.pack(">I", len(raw)) + raw)
+    if payload:
+        sock.sendall(payload)
+
+def recv_message(sock: socket.socket) -> tuple[dict, bytes]:
+    (size,) = struct.unpack(">I", _recv_exact(sock, 4))
+    header = json.loads(_recv_exact(sock, size))
+    payload = _recv_exact(sock, header["payload"]) if header.get("payload") else b""
+    return header, payload
+
+SEGMENT_FIELDS = ("id", "start", "end", "text", "avg_logprob", "compression_ratio", "no_speech_prob", "temperature")
+
+def segment_to_dict(seg) -> dict:
+    return {k: getattr(seg, k, None) for k in SEGMENT_FIELDS}
+
+def info_to_dict(info) -> dict:
+    return {
+        "language": info.language,
+        "language_probability": info.language_probability,
+        "duration": info.duration,
+        "duration_after_vad": info.duration_after_vad,
+    }
+
+class RemoteWhisperModel:
+    """Client for the engine daemon with the subset of the WhisperModel API the app uses."""
+
+    def __init__(self, model_size: str, socket_path: str):
+        self.model_size = model_size
+        self.socket_path = socket_path
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(ENGINE_CONNECT_TIMEOUT_S)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise EngineUnavailable(f"No engine at {self.socket_path}: {e}") from e
+        sock.settimeout(None)
+        return sock
+
+    def ping(self) -> dict:
+        with self._connect() as sock:
+            send_message(sock, {"op": "ping"})
+            header, _ = recv_message(sock)
+        return header
+
+    def transcribe(self, audio: np.ndarray, **options) -> tuple[Iterator[SimpleNamespace], SimpleNamespace]:
+        audio = np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+        sock = self._connect()
+        try:
+            send_message(sock, {"op": "transcribe", "model": self.model_size, "options": options}, audio.tobytes())
+            header, _ = recv_message(sock)
+            if "error" in header:
+                raise RuntimeError(header["error"])
+        except Exception:
+            sock.close()
+            raise
+
+        def segments():
+            with sock:
+                while True:
+                    msg, _ = recv_message(sock)
+                    if "error" in msg:
+                        raise RuntimeError(msg["error"])
+                    if msg.get("done"):
+                        return
+                    yield SimpleNamespace(**msg["segment"])
+
+        return segments(), SimpleNamespace(**header["info"])
+
+    def detect_language(self, audio: np.ndarray, **options) -> tuple[str, float, List[tuple[str, float]]]:
+        audio = np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+        with self._connect() as sock:
+            send_message(sock, {"op": "detect_language", "model": self.model_size, "options": options}, audio.tobytes())
+            header, _ = recv_message(sock)
+        if "error" in header:
+            raise RuntimeError(header["error"])
+        language, probability, all_probs = header["result"]
+        return language, probability, [tuple(p) for p in all_probs]
+
+def connect_engine(model_size: str = MODEL_SIZE) -> RemoteWhisperModel | None:
+    """Returns a client when an engine daemon is listening, else None."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    client = RemoteWhisperModel(model_size, engine_socket_path())
+    try:
+        client.ping()
+    except (OSError, ValueError) as e:
+        print(f"No engine daemon ({e}); loading model in-process.")
+        return None
+    return client
+
+class EngineDaemon:
+    """Headless process that owns the loaded models and serves transcriptions over a Unix socket."""
+
+    def __init__(self, socket_path: str, preload: List[str]):
+        self.socket_path = socket_path
+        self.preload = preload
+        self.models: Dict[str, faster_whisper.WhisperModel] = {}
+        self._models_lock = threading.Lock()
+        self.load_kwargs = saved_load_kwargs()
+
+    def get_model(self, model_size: str) -> faster_whisper.WhisperModel:
+        with self._models_lock:
+            if model_size not in self.models:
+                self.models[model_size] = load_whisper_model(model_size, **self.load_kwargs)
+            return self.models[model_size]
+
+    def serve_forever(self):
+        claim_unix_socket(self.socket_path, "An engine daemon")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        bind_unix_socket(server, self.socket_path)
+        server.listen()
+        print(f"Dictaria engine listening on {self.socket_path}")
+        # Listen before loading: early clients wait on the model lock instead of loading their own copy
+        for size in self.preload:
+            threading.Thread(target=self.get_model, args=(size,), daemon=True).start()
+        try:
+            while True:
+                conn, _ = server.accept()
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def _handle(self, conn: socket.socket):
+        with conn:
+            try:
+                header, payload = recv_message(conn)
+                op = header.get("op")
+                if op == "ping":
+                    send_message(conn, {"ok": True, "models": sorted(self.models)})
+                    return
+
+                model = self.get_model(header["model"])
+                audio = np.frombuffer(payload, dtype=np.float32)
+                options = header.get("options", {})
+                if op == "transcribe":
+                    segments, info = model.transcribe(audio, **options)
+                    send_message(conn, {"info": info_to_dict(info)})
+                    for seg in segments:
+                        send_message(conn, {"segment": segment_to_dict(seg)})
+                    send_message(conn, {"done": True})
+                elif op == "detect_language":
+                    send_message(conn, {"result": model.detect_language(audio=audio, **options)})
+                else:
+                    send_message(conn, {"error": f"Unknown op: {op}"})
+            except EngineUnavailable:
+                pass  # client went away
+            except Exception as e:
+                print(f"Engine request failed: {e}")
+                try:
+                    send_message(conn, {"error": str(e)})
+                except OSError:
+                    pass
+
+def run_daemon(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="dictaria.py daemon", description="Run the shared transcription engine.")
+    parser.add_argument("--socket", default=None, help="Unix socket path (default: per-user runtime dir)")
+    parser.add_argument("--model", action="append", dest="models", help=f"Model to preload (default: {MODEL_SIZE}); repeatable")
+    args = parser.parse_args(argv)
+    if not hasattr(socket, "AF_UNIX"):
+        sys.exit("The engine daemon needs Unix domain sockets, which this platform does not provide.")
+
+    daemon = EngineDaemon(args.socket or engine_socket_path(), args.models or [MODEL_SIZE])
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+# --------------------
+# WORKER PROCESS
+# --------------------
+class WorkerCancelled(Exception):
+    pass
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+class WorkerClosed(RuntimeError):
+    """The model was closed, e.g. swapped out; the caller should use the current one."""
+
+def _worker_main(conn, cancel_event, model_size: str, load_kwargs: Dict):
+    """Child process: owns one model and serves requests from the app over `conn`.
+
+    Audio arrives in a shared memory block named in the request; results go
+    back as one message per segment, so a set `cancel_event` stops the
+    decode at the next segment boundary.
+    """
+    try:
+        model = load_whisper_model(model_size, **load_kwargs)
+    except Exception as e:
+        conn.send({"error": f"model load failed: {e}"})
+        return
+    conn.send({"ready": True})
+    shm = None
+    cached_takes: OrderedDict[int, CachedTake] = OrderedDict()
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return  # the app went away
+        try:
+            if shm is None or shm.name != request["shm"]:
+                if shm is not None:
+                    shm.close()
+                # Spawned children share the app's resource tracker, so the app's unlink() is the only cleanup
+                shm = multiprocessing.shared_memory.SharedMemory(name=request["shm"])
+            audio = np.array(np.ndarray((request["samples"],), dtype=np.float32, buffer=shm.buf))
+            op = request["op"]
+
+            if op == "detect_language":
+                conn.send({"result": list(model.detect_language(audio=audio, **request["options"]))})
+                continue
+
+            if op == "decode_cached":
+                # Keeps features and encoder output in this process, next to the model
+                seq = request["seq"]
+                if seq not in cached_takes:
+                    cached_takes[seq] = CachedTake(seq, audio, request["language"], True)
+                    while len(cached_takes) > TAKE_CACHE_SIZE:
+                        cached_takes.popitem(last=False)
+                metrics = TakeMetrics("retranscribe", request["language"])
+                segments = iter(decode_cached_take(model, cached_takes[seq], request["language"], request["beam_size"], metrics))
+                conn.send({"info": {"stages": metrics.stages}})
+            else:
+                segments, info = model.transcribe(audio, **request["options"])
+                conn.send({"info": info_to_dict(info)})
+
+            for seg in segments:
+                if cancel_event.is_set():
+                    conn.send({"cancelled": True})
+                    break
+                conn.send({"segment": segment_to_dict(seg)})
+            else:
+                conn.send({"done": True})
+        except Exception as e:
+            conn.send({"error": str(e)})
+
+class ProcessWhisperModel:
+    """Runs a model in a child process, with the subset of the WhisperModel API the app uses.
+
+    One request at a time. cancel() interrupts the running decode: the worker
+    stops at the next segment, or is killed after WORKER_CANCEL_GRACE_S and
+    restarted in the background. A worker that dies is restarted on the next
+    request.
+    """
+
+    worker_target = staticmethod(_worker_main)
+
+    def __init__(self, model_size: str, load_kwargs: Dict | None = None, on_restart=None):
+        self.model_size = model_size
+        self.load_kwargs = load_kwargs or {}
+        self.on_restart = on_restart
+        self._ctx = multiprocessing.get_context("spawn")
+        self._request_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._shm: multiprocessing.shared_memory.SharedMemory | None = None
+        self._request_id = 0
+        self._busy = False
+        self._cancelled = False
+        self._closed = False
+        self.process = None
+        self._start()
+
+    def _start(self):
+        self.cancel_event = self._ctx.Event()
+        parent, child = self._ctx.Pipe()
+        self.process = self._ctx.Process(
+            target=self.worker_target, args=(child, self.cancel_event, self.model_size, self.load_kwargs),
+            name=f"dictaria-worker-{self.model_size}", daemon=True,
+        )
+        self.process.start()
+        child.close()
+        self.conn = parent
+        try:
+            msg = self.conn.recv()  # waits for the model load
+        except EOFError:
+            self.process.join(1)
+            raise WorkerCrashed(f"worker exited with code {self.process.exitcode} while loading {self.model_size}")
+        if "error" in msg:
+            raise RuntimeError(msg["error"])
+
+    def _ensure_running(self):
+        with self._start_lock:
+            if self._closed:
+                raise WorkerClosed(f"the {self.model_size} worker was closed")
+            if self.process is not None and self.process.is_alive():
+                return
+            print(f"Restarting transcription worker ({self.model_size})")
+            self.conn.close()
+            self._start()
+        if self.on_restart:
+            self.on_restart()
+
+    def _put_audio(self, audio: np.ndarray) -> int:
+        audio = np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+        if self._shm is None or self._shm.size < audio.nbytes:
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+            # Grown with headroom so consecutive takes reuse one block
+            self._shm = multiprocessing.shared_memory.SharedMemory(create=True, size=max(audio.nbytes * 2, SAMPLE_RATE * 4 * 60))
+        np.ndarray(audio.shape, dtype=np.float32, buffer=self._shm.buf)[:] = audio
+        return len(audio)
+
+    def _request(self, op: str, audio: np.ndarray, **fields) -> dict:
+        """Sends a request and returns its first reply; the caller holds _request_lock until it has read the last one."""
+        self._ensure_running()
+        self._request_id += 1
+        self._cancelled = False
+        self.cancel_event.clear()
+        self._busy = True
+        samples = self._put_audio(audio)
+        self.conn.send(dict(fields, op=op, shm=self._shm.name, samples=samples))
+        return self._recv()
+
+    def _recv(self) -> dict:
+        try:
+            msg = self.conn.recv()
+        except (EOFError, OSError):
+            self._busy = False
+            if self._cancelled:
+                raise WorkerCancelled()
+            self.process.join(1)
+            if not self._closed:
+                threading.Thread(target=self._ensure_running, daemon=True).start()
+            raise WorkerCrashed(f"transcription worker died (exit code {self.process.exitcode})")
+        if "error" in msg:
+            self._busy = False
+            raise RuntimeError(msg["error"])
+        if msg.get("cancelled"):
+            self._busy = False
+            raise WorkerCancelled()
+        return msg
+
+    def _segments(self) -> List[SimpleNamespace]:
+        """Reads the request's replies up to "done", so the pipe is clean for the next request."""
+        segments = []
+        try:
+            while True:
+                msg = self._recv()
+                if msg.get("done"):
+                    return segments
+                segments.append(SimpleNamespace(**msg["segment"]))
+        finally:
+            self._busy = False
+
+    def transcribe(self, audio: np.ndarray, **options) -> tuple[Iterator[SimpleNamespace], SimpleNamespace]:
+        """Like WhisperModel.transcribe, but the segments are decoded before it returns."""
+        with self._request_lock:
+            header = self._request("transcribe", audio, options=options)
+            segments = self._segments()
+        return iter(segments), SimpleNamespace(**header["info"])
+
+    def decode_cached(self, cached: CachedTake, language: str, beam_size: int, metrics: TakeMetrics) -> list:
+        """decode_cached_take() inside the worker, where the take's front-end results are kept."""
+        with self._request_lock:
+            header = self._request("decode_cached", cached.audio(), seq=cached.seq, language=language, beam_size=beam_size)
+            segments = self._segments()
+        for name, seconds in header["info"]["stages"].items():
+            metrics.add(name, seconds)
+        return segments
+
+    def detect_language(self, audio: np.ndarray, **options) -> tuple[str, float, List[tuple[str, float]]]:
+        with self._request_lock:
+            try:
+                language, probability, all_probs = self._request("detect_language", audio, options=options)["result"]
+            finally:
+                self._busy = False
+        return language, probability, [tuple(p) for p in all_probs]
+
+    def cancel(self) -> bool:
+        """Interrupts the running request, if any. Returns immediately."""
+        if not self._busy:
+            return False
+        self._cancelled = True
+        self.cancel_event.set()
+        request_id = self._request_id
+
+        def kill_if_still_busy():
+            if self._busy and self._request_id == request_id and not self._closed:
+                self.process.kill()
+                self._ensure_running()
+
+        threading.Timer(WORKER_CANCEL_GRACE_S, kill_if_still_busy).start()
+        return True
+
+    def close(self, wait: bool = False):
+        """Stops the worker; with wait, a request in progress is allowed to finish first."""
+        if wait:
+            self._request_lock.acquire()
+        try:
+            with self._start_lock:
+                self._closed = True  # a stale reference raises WorkerClosed instead of respawning the worker
+            if self.process is not None and self.process.is_alive():
+                self.process.kill()
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+                self._shm = None
+        finally:
+            if wait:
+                self._request_lock.release()
+
+# --------------------
+# CONTROL SOCKET
+# --------------------
+# One command per line ("toggle", "start", "stop", "cancel", "lang es", "retranscribe 12", "status"); each gets a one-line reply.
+# Usable from hotkey daemons and window managers: echo toggle | nc -U <runtime dir>/control.sock
+
+def control_socket_path() -> str:
+    return os.path.join(runtime_dir(), CONTROL_SOCKET_NAME)
+
+class ControlServer:
+    """Blocking listener thread for the control socket; `handler(command, arg)` returns the reply."""
+
+    def __init__(self, socket_path: str, handler):
+        self.socket_path = socket_path
+        self.handler = handler
+        claim_unix_socket(socket_path, "Another Dictaria window")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        bind_unix_socket(self.server, socket_path)
+        self.server.listen()
+        threading.Thread(target=self._serve, name="dictaria-control", daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return  # closed
+            # Commands are tiny; one client at a time keeps them in order
+            with conn:
+                conn.settimeout(1.0)
+                try:
+                    for line in conn.makefile("r", encoding="utf-8"):
+                        command, _, arg = line.strip().partition(" ")
+                        if command:
+                            conn.sendall((self.handler(command.lower(), arg.strip()) + "\n").encode("utf-8"))
+                except (OSError, ValueError) as e:
+                    print(f"Control connection error: {e}")
+
+    def close(self):
+        self.server.close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+def run_ctl(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="dictaria.py ctl", description="Send a command to the running Dictaria window.")
+    parser.add_argument("command", nargs="+", help="toggle | start | stop | cancel | lang <code> | retranscribe [<take #>] | status")
+    args = parser.parse_args(argv)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(control_socket_path())
+        except OSError as e:
+            sys.exit(f"Dictaria is not running ({e})")
+        sock.sendall((" ".join(args.command) + "\n").encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        reply = sock.makefile("r", encoding="utf-8").readline().strip()
+    print(reply)
+    if not reply.startswith("ok"):
+        sys.exit(1)
+
+# --------------------
+# BATCH TRANSCRIPTION
+# --------------------
+_batch_model = None  # one model per worker process
+
+def _batch_worker_init(model_size: str, cpu_threads: int):
+    global _batch_model
+    _batch_model = load_whisper_model(model_size, cpu_threads=cpu_threads)
+
+def _batch_transcribe_file(path: str, language: str | None) -> dict:
+    """Runs in a worker process. Errors are returned, not raised, so one bad file does not stop the run."""
+    t0 = time.perf_counter()
+    try:
+        segments, info = _batch_model.transcribe(
+            path, language=language, beam_size=BEAM_SIZE, condition_on_previous_text=False
+        )
+        segs = [segment_to_dict(seg) for seg in segments]
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+    return {
+        "path": path,
+        "text": " ".join(seg["text"].strip() for seg in segs).strip(),
+        "language": info.language,
+        "duration": info.duration,
+        "decode_s": round(time.perf_counter() - t0, 3),
+        "segments": segs,
+    }
+
+def find_audio_files(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, names in os.walk(path):
+                files.extend(os.path.join(dirpath, n) for n in names if n.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"Skipping missing path: {path}", file=sys.stderr)
+    return sorted({os.path.abspath(f) for f in files})
+
+class BatchOutput:
+    """JSONL file (one record per input) or a directory of .txt files; either way, finished inputs are skipped on rerun."""
+
+    def __init__(self, output: str, fmt: str, files: List[str], root: str = "."):
+        self.output = output
+        self.fmt = fmt
+        # Fixed, not derived from the inputs: a rerun over a subset or superset must find the same .txt paths
+        self.root = os.path.abspath(root)
+        if fmt == "txt":
+            outside = [f for f in files if os.path.commonpath([self.root, f]) != self.root]
+            if outside:
+                raise ValueError(f"{outside[0]} is outside {self.root}; pass --root with a directory that holds every input")
+            os.makedirs(output, exist_ok=True)
+        elif os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        self.finished = self._load_finished()
+
+    def _txt_path(self, path: str) -> str:
+        # memo.wav -> memo.wav.txt: keeping the extension stops memo.wav and memo.mp3 sharing one output
+        return os.path.join(self.output, os.path.relpath(path, self.root) + ".txt")
+
+    def _load_finished(self) -> set:
+        finished = set()
+        if self.fmt == "jsonl" and os.path.exists(self.output):
+            with open(self.output, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        finished.add(json.loads(line)["path"])
+                    except (ValueError, KeyError):
+                        pass  # a line cut short by an interrupted run
+            with open(self.output, "rb+") as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")  # so the next record does not get glued onto the fragment
+        return finished
+
+    def is_done(self, path: str) -> bool:
+        if self.fmt == "txt":
+            return os.path.exists(self._txt_path(path))
+        return path in self.finished
+
+    def write(self, record: dict):
+        if self.fmt == "txt":
+            target = self._txt_path(record["path"])
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target + ".part", "w", encoding="utf-8") as f:
+                f.write(record["text"] + "\n")
+            os.replace(target + ".part", target)
+        else:
+            with open(self.output, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def run_batch(argv: List[str]):
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(prog="dictaria.py batch", description="Transcribe audio files with a pool of worker processes.")
+    parser.add_argument("paths", nargs="+", help="Audio files or directories (searched recursively)")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file, or a directory with --format txt")
+    parser.add_argument("--format", choices=("jsonl", "txt"), default="jsonl")
+    parser.add_argument("--root", default=".", help="With --format txt: directory whose layout the output mirrors (default: the current one)")
+    parser.add_argument("-j", "--jobs", type=int, default=max(1, cores // 4), help="Worker processes, each loading the model once")
+    parser.add_argument("--threads", type=int, default=0, help="cpu_threads per worker (default: cores / jobs)")
+    parser.add_argument("--model", default=MODEL_SIZE)
+    parser.add_argument("--language", default=None, choices=LANG_CODES, help="Default: detect per file")
+    args = parser.parse_args(argv)
+
+    files = find_audio_files(args.paths)
+    try:
+        out = BatchOutput(args.output, args.format, files, args.root)
+    except ValueError as e:
+        sys.exit(str(e))
+    todo = [f for f in files if not out.is_done(f)]
+    print(f"{len(files)} files, {len(files) - len(todo)} already done, {len(todo)} to transcribe", file=sys.stderr)
+    if not todo:
+        return
+
+    jobs = max(1, min(args.jobs, len(todo)))
+    # Split the cores between workers so they do not oversubscribe the CPU
+    threads = args.threads or max(1, cores // jobs)
+    print(f"{jobs} workers x {threads} threads, model {args.model}", file=sys.stderr)
+
+    failed = 0
+    # spawn, not fork: CTranslate2 thread pools do not survive a fork
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_batch_worker_init,
+        initargs=(args.model, threads),
+    ) as pool:
+        futures = [pool.submit(_batch_transcribe_file, f, args.language) for f in todo]
+        for n, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            record = future.result()
+            if "error" in record:
+                failed += 1
+                print(f"[{n}/{len(todo)}] FAILED {record['path']}: {record['error']}", file=sys.stderr)
+                continue
+            out.write(record)
+            print(f"[{n}/{len(todo)}] {record['path']} ({record['duration']:.1f}s audio in {record['decode_s']:.1f}s)", file=sys.stderr)
+
+    if failed:
+        sys.exit(f"{failed} file(s) failed; rerun the same command to retry them.")
+
+# --------------------
+# TRANSCRIPTION SERVICE
+# --------------------
+# HTTP on localhost, for other tools that want the same engine:
+#   POST /v1/transcribe?language=en&beam_size=5   body: WAV (or any file ffmpeg reads), or raw
+#        16-bit mono 16 kHz PCM with Content-Type "audio/L16; rate=16000" (big-endian, RFC 2586)
+#   -> 200 application/x-ndjson, streamed: {"info": {...}}, {"segment": {...}} per segment, {"done": {...}}
+#   -> 503 when the queue is full, {"error": ...} as the last line if decoding fails
+#   GET /v1/health -> queue and batch counters
+
+class ServiceRequest:
+    """One upload waiting for, or being served by, the scheduler."""
+
+    def __init__(self, audio: np.ndarray, language: str | None, beam_size: int):
+        self.audio = audio
+        self.language = language
+        self.beam_size = beam_size
+        self.replies: queue.Queue = queue.Queue()  # dicts for the client; the last one has "done" or "error"
+        self.queued_at = time.perf_counter()
+        self.abandoned = False  # the client went away
+
+    @property
+    def batchable(self) -> bool:
+        """Clips that fit one Whisper window and name their language can share a batch."""
+        return self.language is not None and len(self.audio) <= SERVE_BATCH_MAX_CLIP_S * SAMPLE_RATE
+
+    @property
+    def batch_key(self) -> tuple:
+        return (self.language, self.beam_size)
+
+class TranscriptionService:
+    """One loaded model shared by many clients.
+
+    A single scheduler thread runs the model. Requests that arrive within
+    `batch_wait` of each other, with the same language and beam size, are
+    decoded together by faster-whisper's batched pipeline. Others run alone
+    through the normal transcribe(), with language detection when none was
+    given. At most `max_queue` requests are waiting or running at a time.
+    """
+
+    def __init__(self, model, max_queue: int = SERVE_MAX_QUEUE, max_batch: int = SERVE_MAX_BATCH, batch_wait: float = SERVE_BATCH_WAIT_S):
+        self.model = model
+        self.batched = faster_whisper.BatchedInferencePipeline(model)
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self.stats = {"requests": 0, "rejected": 0, "batches": 0, "batched_requests": 0}
+        self._queue: queue.Queue = queue.Queue()
+        self._held: deque[ServiceRequest] = deque()  # taken from the queue but not matching the batch being built
+        self._pending = 0
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name="dictaria-service", daemon=True).start()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def reserve(self) -> bool:
+        """Takes a queue slot before the upload is read; False when the queue is full."""
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self.stats["rejected"] += 1
+                return False
+            self._pending += 1
+            self.stats["requests"] += 1
+        return True
+
+    def release(self):
+        """Gives back a reserved slot whose request was never submitted."""
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, request: ServiceRequest):
+        """Queues a request into a slot taken with reserve()."""
+        self._queue.put(request)
+
+    def _next_batch(self) -> List[ServiceRequest]:
+        first = self._held.popleft() if self._held else self._queue.get()
+        batch = [first]
+        if not first.batchable:
+            return batch
+        for request in list(self._held):
+            if len(batch) < self.max_batch and request.batchable and request.batch_key == first.batch_key:
+                self._held.remove(request)
+                batch.append(request)
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.max_batch:
+            try:
+                request = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if request.batchable and request.batch_key == first.batch_key:
+                batch.append(request)
+            else:
+                self._held.append(request)
+        return batch
+
+    def _run(self):
+        while True:
+            taken = self._next_batch()
+            batch = [r for r in taken if not r.abandoned]
+            started = time.perf_counter()
+            try:
+                if len(batch) == 1:
+                    self._transcribe_one(batch[0])
+                elif batch:
+                    self._transcribe_batch(batch)
+                for request in batch:
+                    request.replies.put({"done": {
+                        "queue_s": round(started - request.queued_at, 4),
+                        "decode_s": round(time.perf_counter() - started, 4),
+                        "batch_size": len(batch),
+                    }})
+            except Exception as e:
+                print(f"Service request failed: {e}")
+                for request in batch:
+                    request.replies.put({"error": str(e)})
+            finally:
+                with self._lock:
+                    self._pending -= len(taken)
+
+    def _transcribe_one(self, request: ServiceRequest):
+        segments, info = self.model.transcribe(
+            request.audio, language=request.language, beam_size=request.beam_size, condition_on_previous_text=False
+        )
+        request.replies.put({"info": info_to_dict(info)})
+        for seg in segments:
+            if request.abandoned:
+                return
+            request.replies.put({"segment": segment_to_dict(seg)})
+
+    def _transcribe_batch(self, batch: List[ServiceRequest]):
+        """Decodes several clips in one batched pass over their concatenated audio."""
+        offsets = np.cumsum([0] + [len(r.audio) for r in batch])
+        clips = [{"start": offsets[i] / SAMPLE_RATE, "end": offsets[i + 1] / SAMPLE_RATE} for i in range(len(batch))]
+        starts = [clip["start"] for clip in clips]
+        language, beam_size = batch[0].batch_key
+        segments, _ = self.batched.transcribe(
+            np.concatenate([r.audio for r in batch]), language=language, beam_size=beam_size,
+            batch_size=len(batch), clip_timestamps=clips,
+        )
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["batched_requests"] += len(batch)
+        for i, request in enumerate(batch):
+            duration = len(request.audio) / SAMPLE_RATE
+            request.replies.put({"info": {"language": language, "language_probability": 1.0, "duration": duration, "duration_after_vad": duration}})
+        for seg in segments:
+            i = bisect.bisect_right(starts, seg.start + 1e-3) - 1
+            seg = _shifted(seg, -starts[i])
+            batch[i].replies.put({"segment": segment_to_dict(seg)})
+
+def read_upload(body: bytes, content_type: str) -> np.ndarray:
+    """Mono float32 at SAMPLE_RATE from an uploaded file, or from raw audio/L16 PCM.
+
+    Only an explicit audio/L16 is read as raw samples; anything else,
+    application/octet-stream included, goes to the decoder, which reads the
+    container from the bytes themselves.
+    """
+    kind, _, params = content_type.partition(";")
+    if kind.strip().lower() == "audio/l16":
+        params = {k.strip().lower(): v.strip() for k, _, v in (p.partition("=") for p in params.split(";")) if v}
+        if params.get("rate") != str(SAMPLE_RATE) or params.get("channels", "1") != "1":
+            raise ValueError(f"raw PCM must be sent as audio/L16; rate={SAMPLE_RATE} (mono); send a WAV file for other formats")
+        return np.frombuffer(body[: len(body) // 2 * 2], dtype=">i2").astype(np.float32) / 32768.0
+    return faster_whisper.decode_audio(io.BytesIO(body), sampling_rate=SAMPLE_RATE)
+
+class ServiceHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = SERVE_SOCKET_TIMEOUT_S  # a client that stops sending or reading no longer holds a thread
+    server: ServiceHTTPServer
+
+    def log_message(self, format, *args):
+        pass  # one line per request is printed by do_POST instead
+
+    def _send_json(self, status: int, body: dict, headers: Dict | None = None):
+        data = (json.dumps(body) + "\n").encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path != "/v1/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        service = self.server.service
+        self._send_json(200, dict(service.stats, ok=True, pending=service.pending, max_queue=service.max_queue, model=self.server.model_size))
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/v1/transcribe":
+            self._send_json(404, {"error": "not found"})
+            return
+        query = dict(urllib.parse.parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            self._send_json(411, {"error": "a Content-Length body with the audio is required"})
+            return
+        if length > SERVE_MAX_UPLOAD_BYTES:
+            self._send_json(413, {"error": f"uploads are limited to {SERVE_MAX_UPLOAD_BYTES} bytes"})
+            return
+        service = self.server.service
+        if not service.reserve():
+            self.close_connection = True  # the unread body would be parsed as the next request
+            self._send_json(503, {"error": "queue full, retry later"}, {"Retry-After": "1"})
+            return
+        submitted = False
+        try:
+            body = self.rfile.read(length)
+            if len(body) < length:
+                return  # client went away, or stalled past the socket timeout
+            try:
+                audio = read_upload(body, self.headers.get("Content-Type", "application/octet-stream"))
+                request = ServiceRequest(audio, query.get("language") or None, int(query.get("beam_size", BEAM_SIZE)))
+            except Exception as e:
+                self._send_json(400, {"error": f"could not read the upload: {e}"})
+                return
+            service.submit(request)
+            submitted = True
+        finally:
+            if not submitted:
+                service.release()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
         try:
-            if self.stream:
-                self.stream.stop()
-                self.stream.close()
-                self.stream = None
-        except Exception as e:
-            print(f"Error closing stream: {e}")
+            while True:
+                reply = request.replies.get()
+                line = (json.dumps(reply, ensure_ascii=False) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+                if "done" in reply or "error" in reply:
+                    break
+            self.wfile.write(b"0\r\n\r\n")
+            print(f"{self.client_address[0]} {len(audio) / SAMPLE_RATE:.1f}s {request.language or 'auto'}: {reply}")
+        except OSError:
+            request.abandoned = True  # the scheduler skips or stops it
 
-        chunks = []
-        while not self.queue.empty():
-            chunks.append(self.queue.get())
+class ServiceHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
 
-        if not chunks:
-            return None
+    def __init__(self, address: tuple, service: TranscriptionService, model_size: str):
+        super().__init__(address, ServiceHandler)
+        self.service = service
+        self.model_size = model_size
+
+def run_serve(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="dictaria.py serve", description="Serve the transcription engine over HTTP on localhost.")
+    parser.add_argument("--host", default=SERVE_HOST, help="Address to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=SERVE_PORT)
+    parser.add_argument("--model", default=MODEL_SIZE)
+    parser.add_argument("--max-queue", type=int, default=SERVE_MAX_QUEUE, help="Requests waiting or running before new ones get 503")
+    parser.add_argument("--max-batch", type=int, default=SERVE_MAX_BATCH, help="Requests decoded together in one batch")
+    parser.add_argument("--batch-wait-ms", type=float, default=SERVE_BATCH_WAIT_S * 1000, help="How long to wait for requests to batch with")
+    args = parser.parse_args(argv)
+
+    model = load_whisper_model(args.model, **saved_load_kwargs())
+    service = TranscriptionService(model, args.max_queue, args.max_batch, args.batch_wait_ms / 1000)
+    server = ServiceHTTPServer((args.host, args.port), service, args.model)
+    print(f"Dictaria service on http://{args.host}:{server.server_port}/v1/transcribe (model {args.model})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
-        return np.concatenate(chunks, axis=0)
+def run_client(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="dictaria.py client", description="Send an audio file to a running `dictaria.py serve`.")
+    parser.add_argument("file", help="Audio file; with --raw, s16le mono 16 kHz samples")
+    parser.add_argument("--url", default=f"http://{SERVE_HOST}:{SERVE_PORT}")
+    parser.add_argument("--language", default=None, help="Language code (default: detect)")
+    parser.add_argument("--beam-size", type=int, default=BEAM_SIZE)
+    parser.add_argument("--raw", action="store_true", help="Upload the file as raw PCM")
+    parser.add_argument("--json", action="store_true", help="Print the NDJSON replies as they arrive")
+    args = parser.parse_args(argv)
+
+    url = urllib.parse.urlsplit(args.url)
+    query = urllib.parse.urlencode({k: v for k, v in (("language", args.language), ("beam_size", args.beam_size)) if v})
+    with open(args.file, "rb") as f:
+        body = f.read()
+    if args.raw:
+        body = np.frombuffer(body[: len(body) // 2 * 2], dtype="<i2").astype(">i2").tobytes()  # audio/L16 is big-endian
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80)
+    conn.request("POST", f"/v1/transcribe?{query}", body=body, headers={
+        "Content-Type": f"audio/L16; rate={SAMPLE_RATE}" if args.raw else mimetypes.guess_type(args.file)[0] or "audio/unknown",
+    })
+    response = conn.getresponse()
+    if response.status != 200:
+        sys.exit(f"{response.status} {response.reason}: {response.read().decode().strip()}")
+    for line in response:
+        if args.json:
+            print(line.decode().rstrip())
+            continue
+        reply = json.loads(line)
+        if "segment" in reply:
+            seg = reply["segment"]
+            print(f"[{seg['start']:7.2f} -> {seg['end']:7.2f}] {seg['text'].strip()}")
+        elif "error" in reply:
+            sys.exit(f"error: {reply['error']}")
+        elif "done" in reply:
+            done = reply["done"]
+            print(f"(queued {done['queue_s']:.2f}s, decoded {done['decode_s']:.2f}s in a batch of {done['batch_size']})", file=sys.stderr)
 
 # --------------------
 # MAIN APPLICATION
 # --------------------
 class DictariaApp:
     def __init__(self, root: tk.Tk):
-        self.root = root
-        self.theme = THEME
-        
-        # Concurrency: ThreadPool for tasks preventing UI freeze
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
-
-        self.config_manager = ConfigManager(CONFIG_PATH, LANG_CODES[0])
-        self.active_language = self.config_manager.active_language
-        self.recorder = AudioRecorder(sample_rate=SAMPLE_RATE)
-        
-        self.model = None
-        self.model_loading = True
-        self.is_pinned = False
-        self.is_collapsed = False
-        self.is_speaker_active = True
-        
-        # Flag to prevent double clicking or race conditions while processing audio
-        self.is_processing = False
+        self._init_state(root, ConfigManager(CONFIG_PATH, LANG_CODES[0]), AudioRecorder(sample_rate=SAMPLE_RATE), MetricsLog(), TranscriptStore())
 
         self.INITIAL_SIZE = "300x400"
         self.FULL_MIN_WIDTH = 280
@@ -232,7 +2834,10 @@ class DictariaApp:
 
         # Load model in background
         self.executor.submit(self._load_model_task)
+        self.config_manager.watch(lambda: self.root.after(0, self.apply_settings_from_file))
 
+        self.root.after(WARM_STREAM_CHECK_MS, self._check_warm_stream_idle)
+        self.start_control_listener()
         if IS_MAC:
             self.start_hammerspoon_listener()
         else:
@@ -242,6 +2847,45 @@ class DictariaApp:
         self.last_expanded_width = self.root.winfo_width()
         self.last_expanded_height = self.root.winfo_height()
 
+    def _init_state(self, root, config_manager: ConfigManager, recorder: AudioRecorder, metrics_log: MetricsLog,
+                    history: TranscriptStore, max_pending: int = MAX_PENDING_TAKES):
+        """Everything but the widgets; shared with headless drivers such as dictaria_soak.py."""
+        self.root = root
+        self.theme = THEME
+        
+        # Concurrency: ThreadPool for tasks preventing UI freeze
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+
+        self.config_manager = config_manager
+        self.active_language = self.config_manager.active_language
+        self.recorder = recorder
+        
+        self.metrics_log = metrics_log
+        self.history = history
+        self.take_cache = TakeCache()
+        self.retranscribe_model: OnDemandModel | None = None  # at most one other size, loaded on the executor
+        self.retranscribe_model_loading: str | None = None
+        self.history_paging = False
+        self.pipeline = TakePipeline(
+            max_pending=max_pending,
+            on_change=lambda n: self.root.after(0, self.update_record_button_style),
+            on_dropped=lambda take: self.safe_append_system(MSG_TAKE_DROPPED.format(take.seq), "error"),
+        )
+        self.current_take: Take | None = None
+        self.model = None
+        self.model_settings: PerformanceSettings | None = None  # what self.model was loaded with
+        self._model_swap_lock = threading.Lock()
+        self.draft_model = None
+        self.model_loading = True
+        self.take_counter = 0
+        self.is_pinned = False
+        self.is_collapsed = False
+        self.is_speaker_active = True
+        self.control_server: ControlServer | None = None
+        
+        # Set while the stream of the previous take is being closed; the next take waits for it
+        self.is_stopping = False
+
     def start_pynput_hotkey_listener(self):
         try:
             from pynput import keyboard
@@ -258,11 +2902,58 @@ class DictariaApp:
         except Exception as e:
             print(f"Hotkey error: {e}")
 
+    # --------------------
+    # CONTROL SOCKET LISTENER
+    # --------------------
+    def start_control_listener(self):
+        if not hasattr(socket, "AF_UNIX"):
+            return
+        try:
+            self.control_server = ControlServer(control_socket_path(), self.handle_control_command)
+            print(f"Control socket: {self.control_server.socket_path}")
+        except (OSError, RuntimeError) as e:
+            print(f"Control socket disabled: {e}")
+
+    def handle_control_command(self, command: str, arg: str) -> str:
+        """Runs on the listener thread: validates, then hands the action to Tk."""
+        if command == "status":
+            if self.model_loading:
+                return "ok loading"
+            return "ok recording" if self.recorder.is_recording else "ok idle"
+        if command == "toggle":
+            self.root.after(0, self.toggle_record)
+        elif command == "start":
+            self.root.after(0, lambda: None if self.recorder.is_recording else self.toggle_record())
+        elif command == "stop":
+            self.root.after(0, lambda: self.toggle_record() if self.recorder.is_recording else None)
+        elif command == "cancel":
+            self.root.after(0, self.cancel_transcription)
+        elif command == "retranscribe":
+            if arg and not arg.isdigit():
+                return f"error expected a take number, got {arg!r}"
+            if arg and self.take_cache.get(int(arg)) is None:
+                cached = " ".join(str(c.seq) for c in reversed(self.take_cache.recent())) or "none"
+                return f"error take #{arg} is not cached (cached: {cached})"
+            self.root.after(0, lambda: self.retranscribe(seq=int(arg) if arg else None))
+        elif command == "lang":
+            if arg not in LANG_CHOICES:
+                return f"error unknown language {arg!r} (expected one of {', '.join(LANG_CHOICES)})"
+            self.root.after(0, lambda: self.lang_var.set(LANG_OPTIONS[list(LANG_CHOICES).index(arg)]))
+        else:
+            return f"error unknown command {command!r}"
+        return "ok"
+
     # --------------------
     # HAMMERSPOON LISTENER (Fixed & Completed)
     # --------------------
     def start_hammerspoon_listener(self):
-        """Poll for file existence safely using root.after to avoid freezing."""
+        """Poll for file existence safely using root.after to avoid freezing.
+
+        Fallback only: with the control socket up, the file is checked rarely,
+        just so Hammerspoon configs that still touch it keep working.
+        """
+        interval = SIGNAL_LEGACY_POLL_MS if self.control_server else SIGNAL_POLL_MS
+
         def check_signal():
             if os.path.exists(SIGNAL_FILE):
                 try:
@@ -271,8 +2962,7 @@ class DictariaApp:
                     self.toggle_record()
                 except OSError as e:
                     print(f"Error removing signal file: {e}")
-            # Check again in 200ms
-            self.root.after(200, check_signal)
+            self.root.after(interval, check_signal)
             
         # Start the polling loop
         check_signal()
@@ -333,6 +3023,58 @@ class DictariaApp:
         self.collapse_text = self.btn_collapse.create_text(10, 10, text="▿", font=("Helvetica", 14), fill=self.theme["pin_inactive_fg"])
         self.btn_collapse.bind("<Button-1>", lambda e: self.toggle_collapse())
         
+        # Options
+        self.streaming_var = tk.BooleanVar(self.controls_frame, value=self.config_manager.streaming)
+        self.btn_options = tk.Menubutton(self.controls_frame, text="≡", font=("Helvetica", 14), bg=self.theme["root_bg"], fg=self.theme["pin_inactive_fg"], activebackground=self.theme["root_bg"], bd=0, highlightthickness=0)
+        self.options_menu = tk.Menu(self.btn_options, tearoff=0, bg=self.theme["topbar_bg"], fg=self.theme["topbar_fg"])
+        self.options_menu.add_checkbutton(label="Streaming transcription", variable=self.streaming_var, command=self.toggle_streaming)
+        self.two_pass_var = tk.BooleanVar(self.controls_frame, value=self.config_manager.two_pass)
+        self.options_menu.add_checkbutton(label="Fast draft, then final pass", variable=self.two_pass_var, command=self.toggle_two_pass)
+        self.show_timings_var = tk.BooleanVar(self.controls_frame, value=self.config_manager.show_timings)
+        self.options_menu.add_checkbutton(label="Show timing details", variable=self.show_timings_var, command=self.toggle_show_timings)
+        self.long_form_var = tk.BooleanVar(self.controls_frame, value=self.config_manager.long_form)
+        self.options_menu.add_checkbutton(label="Long recording mode (spill to disk)", variable=self.long_form_var, command=self.toggle_long_form)
+        self.warm_stream_var = tk.BooleanVar(self.controls_frame, value=self.config_manager.warm_stream)
+        self.options_menu.add_checkbutton(label="Keep microphone open (instant start)", variable=self.warm_stream_var, command=self.toggle_warm_stream)
+        self.options_menu.add_separator()
+        performance = self.config_manager.performance
+        self.model_size_var = tk.StringVar(self.controls_frame, value=performance.model_size)
+        self.model_menu = tk.Menu(self.options_menu, tearoff=0, bg=self.theme["topbar_bg"], fg=self.theme["topbar_fg"])
+        for size in MODEL_CHOICES:
+            self.model_menu.add_radiobutton(label=size, value=size, variable=self.model_size_var, command=self.set_performance_from_menu)
+        self.options_menu.add_cascade(label="Model", menu=self.model_menu)
+        self.beam_size_var = tk.IntVar(self.controls_frame, value=performance.beam_size)
+        self.beam_menu = tk.Menu(self.options_menu, tearoff=0, bg=self.theme["topbar_bg"], fg=self.theme["topbar_fg"])
+        for beam in BEAM_SIZE_CHOICES:
+            self.beam_menu.add_radiobutton(label=f"{beam}" + (" (fastest)" if beam == 1 else ""), value=beam, variable=self.beam_size_var, command=self.set_performance_from_menu)
+        self.options_menu.add_cascade(label="Beam size", menu=self.beam_menu)
+        self.adaptive_var = tk.BooleanVar(self.controls_frame, value=performance.adaptive)
+        self.options_menu.add_checkbutton(label="Greedy first for short clips", variable=self.adaptive_var, command=self.set_performance_from_menu)
+        self.vad_var = tk.BooleanVar(self.controls_frame, value=performance.vad_enabled)
+        self.options_menu.add_checkbutton(label="Trim silence before decoding", variable=self.vad_var, command=self.set_performance_from_menu)
+        self.options_menu.add_separator()
+        self.retranscribe_menu = tk.Menu(self.options_menu, tearoff=0, bg=self.theme["topbar_bg"], fg=self.theme["topbar_fg"],
+                                         postcommand=self._update_retranscribe_menu)
+        self.retranscribe_seq_var = tk.IntVar(self.controls_frame, value=0)  # 0: the latest take
+        self.retranscribe_take_menu = tk.Menu(self.retranscribe_menu, tearoff=0, bg=self.theme["topbar_bg"], fg=self.theme["topbar_fg"],
+                                              postcommand=self._fill_retranscribe_take_menu)
+        self.retranscribe_menu.add_cascade(label="Take", menu=self.retranscribe_take_menu)
+        self.retranscribe_menu.add_separator()
+        for code, lang in LANG_DEFS.items():
+            self.retranscribe_menu.add_command(label=f"As {lang.name} {lang.flag}", command=lambda c=code: self.retranscribe(language=c, seq=self.retranscribe_seq_var.get()))
+        self.retranscribe_menu.add_separator()
+        self.retranscribe_menu.add_command(label=f"Higher accuracy (beam {RETRANSCRIBE_BEAM_SIZE})",
+                                           command=lambda: self.retranscribe(beam_size=RETRANSCRIBE_BEAM_SIZE, seq=self.retranscribe_seq_var.get()))
+        self.retranscribe_model_entries: Dict[str, int] = {}
+        for size in RETRANSCRIBE_MODEL_SIZES:
+            self.retranscribe_menu.add_command(label=f"With model {size}", command=lambda m=size: self.retranscribe(model_size=m, seq=self.retranscribe_seq_var.get()))
+            self.retranscribe_model_entries[size] = self.retranscribe_menu.index("end")
+        self.options_menu.add_cascade(label="Re-transcribe a take", menu=self.retranscribe_menu)
+        self.options_menu.add_command(label="Search history…", command=self.open_history_search)
+        self.options_menu.add_command(label="Cancel current transcription (Esc)", command=self.cancel_transcription)
+        self.btn_options["menu"] = self.options_menu
+        self.btn_options.grid(row=0, column=3, sticky="e")
+
         # Lang
         self.lang_var = tk.StringVar(self.controls_frame)
         self.lang_var.trace_add("write", self.set_active_language_from_menu)
@@ -345,8 +3087,11 @@ class DictariaApp:
         self.canvas_btn = tk.Canvas(self.record_button_frame, width=60, height=60, bg=self.theme["root_bg"], highlightthickness=0, bd=0)
         self.canvas_btn.pack()
         self.record_indicator = self.canvas_btn.create_oval(4, 4, 56, 56, width=2)
+        # Number of takes waiting for (or in) transcription, drawn on the button
+        self.queue_indicator = self.canvas_btn.create_text(30, 30, text="", fill=self.theme["text_fg"], font=("Helvetica", 14, "bold"))
         self.canvas_btn.bind("<Button-1>", lambda e: self.toggle_record())
         self.canvas_btn.bind("<Configure>", self._on_record_canvas_resize)
+        self.root.bind("<Escape>", lambda e: self.cancel_transcription())
 
     def _build_text_box(self):
         self.text_box = scrolledtext.ScrolledText(
@@ -357,12 +3102,19 @@ class DictariaApp:
         self.text_box.pack(fill="both", expand=True)
         self.text_box.tag_config("sys", foreground=self.theme["record_idle_fill"], font=("Helvetica", 10, "italic"))
         self.text_box.tag_config("error", foreground="#ef4444", font=("Helvetica", 10, "bold"))
+        self.text_box.tag_config("draft", foreground=self.theme["pin_inactive_fg"])
+        self.text_box.tag_config("history", foreground=self.theme["pin_inactive_fg"])
+        # Reaching the top by hand pages in older entries from the history store
+        self.text_box.vbar.configure(command=lambda *args: (self.text_box.yview(*args), self._on_user_scroll()))
+        self.text_box.bind("<MouseWheel>", self._on_user_scroll, add="+")
+        self.text_box.bind("<Button-4>", self._on_user_scroll, add="+")
 
     def _on_record_canvas_resize(self, event):
         size = min(event.width, event.height) - 4
         if size <= 0: return
         x0, y0 = (event.width - size)/2, (event.height - size)/2
         self.canvas_btn.coords(self.record_indicator, x0, y0, x0+size, y0+size)
+        self.canvas_btn.coords(self.queue_indicator, event.width/2, event.height/2)
 
     # --------------------
     # LOGIC - COLLAPSE / SPEAKER
@@ -374,6 +3126,7 @@ class DictariaApp:
             self.last_expanded_height = self.root.winfo_height()
             
             self.option_menu_lang.grid_remove()
+            self.btn_options.grid_remove()
             self.text_frame.pack_forget()
             
             # Distributed layout
@@ -396,6 +3149,7 @@ class DictariaApp:
             self.controls_frame.columnconfigure(1, weight=0)
             self.controls_frame.columnconfigure(3, weight=1)
             
+            self.btn_options.grid(row=0, column=3, sticky="e")
             self.option_menu_lang.grid(row=0, column=4, sticky="e")
             self.text_frame.pack(fill="both", expand=True)
             
@@ -431,7 +3185,7 @@ class DictariaApp:
     # --------------------
     def set_active_language_from_menu(self, *args):
         txt = self.lang_var.get()
-        for c, d in LANG_DEFS.items():
+        for c, d in LANG_CHOICES.items():
             if txt.startswith(d.name):
                 self.active_language = c
                 self.config_manager.active_language = c
@@ -440,9 +3194,111 @@ class DictariaApp:
                 break
         self.update_record_button_style()
 
+    def toggle_streaming(self):
+        self.config_manager.streaming = self.streaming_var.get()
+        self.config_manager.save()
+        state = "on" if self.config_manager.streaming else "off"
+        self.append_system(f"[Streaming transcription: {state}]")
+
+    def toggle_two_pass(self):
+        self.config_manager.two_pass = self.two_pass_var.get()
+        self.config_manager.save()
+        state = "on" if self.config_manager.two_pass else "off"
+        self.append_system(f"[Draft + final pass: {state}]")
+        if self.config_manager.two_pass and self.draft_model is None and not self.model_loading:
+            self.executor.submit(self._load_draft_model_task)
+
+    def toggle_show_timings(self):
+        self.config_manager.show_timings = self.show_timings_var.get()
+        self.config_manager.save()
+
+    def toggle_long_form(self):
+        self.config_manager.long_form = self.long_form_var.get()
+        self.config_manager.save()
+        state = "on" if self.config_manager.long_form else "off"
+        self.append_system(f"[Long recording mode: {state}]")
+
+    def toggle_warm_stream(self):
+        self.config_manager.warm_stream = self.warm_stream_var.get()
+        self.config_manager.save()
+        state = "on" if self.config_manager.warm_stream else "off"
+        self.append_system(f"[Keep microphone open: {state}]")
+        if not self.model_loading:  # otherwise applied once the audio stack has loaded
+            self.executor.submit(self._apply_warm_stream)
+
+    def _apply_warm_stream(self):
+        try:
+            self.recorder.set_warm(self.config_manager.warm_stream)
+        except Exception as e:
+            self.safe_append_system(MSG_ERROR.format(e), "error")
+
+    def _check_warm_stream_idle(self):
+        if WARM_STREAM_IDLE_S and self.recorder.warm:
+            self.executor.submit(self.recorder.release_if_idle, WARM_STREAM_IDLE_S)
+        self.root.after(WARM_STREAM_CHECK_MS, self._check_warm_stream_idle)
+
+    def set_performance_from_menu(self):
+        self.config_manager.performance = self.config_manager.performance._replace(
+            model_size=self.model_size_var.get(), beam_size=self.beam_size_var.get(),
+            adaptive=self.adaptive_var.get(), vad_enabled=self.vad_var.get(),
+        )
+        self.config_manager.save()
+        self.apply_performance()
+
+    def apply_settings_from_file(self):
+        """Brings the running app in line with a config file edited outside it."""
+        cm = self.config_manager
+        self.append_system(MSG_SETTINGS_RELOADED)
+        if cm.active_language != self.active_language:
+            self.active_language = cm.active_language
+            self.apply_config_to_ui()
+        toggles = (
+            (self.streaming_var, cm.streaming, self.toggle_streaming),
+            (self.two_pass_var, cm.two_pass, self.toggle_two_pass),
+            (self.show_timings_var, cm.show_timings, self.toggle_show_timings),
+            (self.long_form_var, cm.long_form, self.toggle_long_form),
+            (self.warm_stream_var, cm.warm_stream, self.toggle_warm_stream),
+        )
+        for var, value, toggle in toggles:
+            if var.get() != value:
+                var.set(value)
+                toggle()
+        self.apply_performance()
+
+    def apply_performance(self):
+        """Beam size and VAD are read at every decode; a new model loads in the background."""
+        settings = self.config_manager.performance
+        self.model_size_var.set(settings.model_size)
+        self.beam_size_var.set(settings.beam_size)
+        self.adaptive_var.set(settings.adaptive)
+        self.vad_var.set(settings.vad_enabled)
+        if self.model_settings is not None and settings.model_key() != self.model_settings.model_key():
+            self.executor.submit(self._swap_model_task)
+
+    def _swap_model_task(self):
+        """Loads the model for the current settings while the old one keeps serving, then swaps them."""
+        with self._model_swap_lock:  # one load at a time; each picks up the newest settings
+            settings = self.config_manager.performance
+            if settings.model_key() == self.model_settings.model_key():
+                return
+            self.safe_append_system(MSG_SWITCHING_MODEL.format(settings.model_size))
+            try:
+                model = self._load_model(settings.model_size)
+            except Exception as e:
+                self.safe_append_system(MSG_ERROR.format(e), "error")
+                return
+            old, self.model = self.model, model
+            self.model_settings = settings
+        # The daemon loads with its own options, so only the model size follows the settings there
+        switched = MSG_MODEL_SWITCHED_DAEMON if isinstance(model, RemoteWhisperModel) else MSG_MODEL_SWITCHED
+        self.safe_append_system(switched.format(settings.model_size))
+        # A decode still running on the old model finishes there; an in-process model is freed with its last user
+        if isinstance(old, ProcessWhisperModel):
+            old.close(wait=True)
+
     def apply_config_to_ui(self):
-        if self.active_language in LANG_DEFS:
-            d = LANG_DEFS[self.active_language]
+        if self.active_language in LANG_CHOICES:
+            d = LANG_CHOICES[self.active_language]
             self.lang_var.set(f"{d.name} {d.flag}")
         self.update_record_button_style()
         self._update_speaker_icon_style()
@@ -454,13 +3310,78 @@ class DictariaApp:
         color = self.theme["pin_active_fg"] if self.is_pinned else self.theme["pin_inactive_fg"]
         self.btn_pin.itemconfig(self.pin_text, text=icon, fill=color)
 
+    def _load_model(self, model_size: str):
+        """Shared loader: the engine daemon when one is running, else an in-process model."""
+        model = connect_engine(model_size)
+        if model is not None:
+            self.safe_append_system(MSG_ENGINE_CONNECTED)
+            return model
+        return self._load_local_model(model_size)
+
+    def _load_local_model(self, model_size: str):
+        """A model in a worker process (so it can be cancelled), or in this process if the worker cannot start."""
+        load_kwargs = self.config_manager.performance.load_kwargs(self._ensure_hardware_profile())
+        if WORKER_PROCESS:
+            try:
+                return ProcessWhisperModel(
+                    model_size, load_kwargs, on_restart=lambda: self.safe_append_system(MSG_WORKER_RESTARTED, "error")
+                )
+            except Exception as e:
+                print(f"Worker process unavailable, loading in-process: {e}")
+        return load_whisper_model(model_size, **load_kwargs)
+
+    def _loaded_models(self) -> list:
+        extra = self.retranscribe_model.model if self.retranscribe_model else None
+        return [m for m in (self.model, self.draft_model, extra) if m is not None]
+
+    def close_models(self):
+        for model in self._loaded_models():
+            if isinstance(model, ProcessWhisperModel):
+                model.close()
+
+    def _ensure_hardware_profile(self) -> HardwareProfile:
+        """The cached calibration, running it first if this machine has none yet."""
+        profile = self.config_manager.hardware_profile
+        if profile is not None and profile.applies_here():
+            return profile
+        self.safe_append_system(MSG_TUNING)
+        try:
+            profile = tune_hardware(self.config_manager.performance.model_size)
+        except Exception as e:
+            print(f"Calibration failed, using defaults: {e}")
+            return HardwareProfile(DEVICE, COMPUTE_TYPE, 0, 1, 0.0, MODEL_SIZE, machine_fingerprint())
+        self.config_manager.hardware_profile = profile
+        self.config_manager.save()
+        self.safe_append_system(MSG_TUNED.format(profile.compute_type, profile.cpu_threads))
+        return profile
+
     def _load_model_task(self):
         try:
-            print(f"Loading Model {MODEL_SIZE} on {DEVICE}...")
-            self.model = WhisperModel(MODEL_SIZE, device=DEVICE, compute_type=COMPUTE_TYPE)
+            # The window is already up; the audio and inference libraries load here, off the Tk thread
+            import_heavy_modules()
+            if self.config_manager.warm_stream:
+                self._apply_warm_stream()
+            settings = self.config_manager.performance
+            with STARTUP.phase("model load"):
+                self.model = self._load_model(settings.model_size)
+            self.model_settings = settings
             self.model_loading = False
             self.safe_append_system(MSG_MODEL_READY)
+            # Only now: the resumed sessions' jobs need the model
+            self.root.after(0, self._resume_long_form_sessions)
             self.root.after(0, self.update_record_button_style)
+            STARTUP.mark("ready")
+            STARTUP.report()
+        except Exception as e:
+            self.safe_append_system(MSG_ERROR.format(e), "error")
+            return
+        if self.config_manager.two_pass:
+            self._load_draft_model_task()
+
+    def _load_draft_model_task(self):
+        try:
+            self.draft_model = self._load_model(DRAFT_MODEL_SIZE)
+            self.safe_append_system(MSG_DRAFT_MODEL_READY)
         except Exception as e:
             self.safe_append_system(MSG_ERROR.format(e), "error")
 
@@ -468,72 +3389,562 @@ class DictariaApp:
     # CORE RECORDING LOGIC (Optimized)
     # --------------------
     def toggle_record(self):
-        # 1. Prevent actions if model loading or busy processing
+        # 1. Prevent actions if model loading or the previous stream is still closing
         if self.model_loading:
             self.append_system(MSG_LOADING_MODEL, tag="error")
             return
-        if self.is_processing:
-            print("Busy processing, ignoring click.")
+        if self.is_stopping:
+            print("Still stopping previous take, ignoring click.")
             return
 
         # 2. Start Recording (Safe on main thread usually)
         if not self.recorder.is_recording:
-            try:
-                self.recorder.start()
-                self.update_record_button_style()
-                self.append_system(MSG_LISTENING)
-            except Exception as e:
-                self.append_system(MSG_ERROR.format(e), "error")
+            self.start_take()
         
         # 3. Stop Recording -> MOVE TO THREAD to prevent freeze
         else:
-            self.is_processing = True # Lock UI logic
-            self.append_system(MSG_STOPPING) 
-            self.update_record_button_style() # Visual feedback immediately
-            
-            # Offload heavy stopping and transcription to background thread
-            lang = self.active_language
-            self.executor.submit(self._stop_and_transcribe_task, lang)
+            self.stop_take()
+
+    def start_take(self):
+        lang = self.active_language
+        long_form = self.config_manager.long_form
+        streaming = self.config_manager.streaming and not long_form
+        if long_form:
+            mode = "long_form"
+        elif streaming:
+            mode = "streaming"
+        elif self.config_manager.two_pass and self.draft_model is not None:
+            mode = "two_pass"
+        else:
+            mode = "single"
+        language = None if lang == LANG_AUTO else lang
+        take = Take(self.take_counter + 1, language, TakeMetrics(mode, lang), streaming)
+
+        if not self.pipeline.open_take(take):
+            self.append_system(MSG_QUEUE_FULL, "error")
+            return
+        try:
+            if long_form:
+                take.long_form = LongFormSession.create(language)
+                self.recorder.start(SpillBuffer(take.long_form.audio_path, SAMPLE_RATE))
+            else:
+                self.recorder.start()
+        except Exception as e:
+            if take.long_form:
+                take.long_form.remove()
+            self.pipeline.finish_take(take)
+            self.append_system(MSG_ERROR.format(e), "error")
+            return
+
+        self.take_counter = take.seq
+        self.current_take = take
+        self.update_record_button_style()
+        self.append_system(MSG_LISTENING)
+        if streaming:
+            self.begin_partial(take)
+            take.chunker = SilenceChunker(SAMPLE_RATE)
+            take.poller = self.executor.submit(self._stream_poll_task, take)
+        if language is None:
+            # Own thread: behind queued decodes on the executor it would only run after the take ends
+            threading.Thread(target=self._early_language_task, args=(take, self.recorder.buffer),
+                             name="dictaria-language", daemon=True).start()
+
+    def _early_language_task(self, take: Take, buffer: AudioRingBuffer | SpillBuffer):
+        """Runs while recording: decides an "Auto" take's language once AUTO_DETECT_AFTER_S is in `buffer`, the take's own."""
+        needed = int(AUTO_DETECT_AFTER_S * SAMPLE_RATE)
+        while buffer.total_written < needed:
+            if take.stopped.wait(AUTO_DETECT_POLL_S):
+                return  # a short take: its first job detects on the whole clip
+        with take.detect_lock:
+            if take.language is not None or take.stopped.is_set():
+                return
+            audio, _ = buffer.read_since(0)
+            if take.stopped.is_set():
+                return  # the ring buffer may already hold the next take; the job detects after stop
+            try:
+                self._detect_language(take, audio[:needed])
+            except Exception as e:
+                print(f"Early language detection failed, retrying after stop: {e}")
+
+    def _ensure_language(self, take: Take, audio: np.ndarray):
+        """Gives an "Auto" take its language, unless the early detection already has. Detected once per take."""
+        if take.language is not None:
+            return
+        with take.detect_lock:  # waits for an early detection in progress
+            if take.language is None:
+                self._detect_language(take, audio)
+
+    def _detect_language(self, take: Take, audio: np.ndarray):
+        started = time.perf_counter()
+        model = self.model
+        try:
+            code, probability = detect_language_among(model, audio)
+        except WorkerClosed:
+            if model is self.model:
+                raise
+            code, probability = detect_language_among(self.model, audio)
+        take.metrics.set(
+            language=code,
+            language_probability=round(probability, 3),
+            language_detect_s=round(time.perf_counter() - started, 4),
+            language_detect_audio_s=round(len(audio) / SAMPLE_RATE, 2),
+        )
+        take.language = code
+        lang = LANG_DEFS[code]
+        self.safe_append_system(MSG_LANGUAGE_DETECTED.format(lang.name, lang.flag, probability))
+
+    def stop_take(self):
+        take, self.current_take = self.current_take, None
+        take.metrics.restart_clock()
+        self.is_stopping = True
+        self.append_system(MSG_STOPPING) 
+        self.update_record_button_style() # Visual feedback immediately
+        
+        # Offload heavy stopping to background thread; transcription is queued behind earlier takes
+        self.executor.submit(self._stop_take_task, take)
+
+    def _stop_take_task(self, take: Take):
+        """Runs in background thread: closes the stream and queues the take for the transcription worker."""
+        try:
+            audio = self._stop_recorder(take.metrics)
+            take.stopped.set()
+
+            if take.long_form:
+                self.recorder.buffer.close()
+                take.long_form.finish_recording(self.recorder.buffer.total_written)
+                self.pipeline.submit(take, self._long_form_job, take)
+            elif take.streaming:
+                if audio is not None:
+                    self.take_cache.add(take.seq, audio, take.language, trimmed=False)
+                take.poller.result()  # the poller queues its last chunks before the tail
+                tail_chunks = take.chunker.feed(self.recorder.drain())
+                tail = take.chunker.flush()
+                if tail is not None:
+                    tail_chunks.append(tail)
+                for chunk in tail_chunks:
+                    self.pipeline.submit(take, self._decode_chunk_job, take, chunk, "tail_decode")
+                self.pipeline.submit(take, self._finish_stream_job, take)
+            else:
+                take.queued_at = time.perf_counter()
+                self.pipeline.submit(take, self._transcribe_take_job, take, audio)
+        except Exception as e:
+            self.pipeline.finish_take(take)
+            self.safe_append_system(MSG_ERROR.format(e), "error")
+        finally:
+            # The recorder is free again: the next take can start while this one transcribes
+            self.is_stopping = False
+            self.root.after(0, self.update_record_button_style)
+
+    def _transcribe(self, audio: np.ndarray, lang: str, metrics: TakeMetrics, stage: str = "decode", draft: bool = False) -> str:
+        """Runs the model (or the draft model) over one clip straight from memory and returns the joined text."""
+        return " ".join(seg.text.strip() for seg in self._decode_segments(audio, lang, metrics, stage, draft)).strip()
 
-    def _stop_and_transcribe_task(self, lang: str):
-        """Runs in background thread: Stops audio, concatenates, transcribes."""
+    def _decode_segments(self, audio: np.ndarray, lang: str, metrics: TakeMetrics, stage: str = "decode", draft: bool = False) -> list:
+        # faster-whisper takes a mono float32 array at 16 kHz, which is what the recorder produces
+        audio = np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+        if DEBUG_WAV_DIR and not draft:
+            with metrics.span("wav_export"):
+                export_debug_wav(audio, DEBUG_WAV_DIR)
+
+        model = self.draft_model if draft else self.model
+        settings = self.config_manager.performance
         try:
+            return decode_adaptive(model, audio, lang, settings.beam_size, metrics, stage, settings.adaptive)
+        except WorkerClosed:
+            if model is (self.draft_model if draft else self.model):
+                raise
+            return self._decode_segments(audio, lang, metrics, stage, draft)  # swapped meanwhile: use the new model
+        except EngineUnavailable:
+            # The daemon went away mid-session: fall back to an in-process model and retry once
+            self.safe_append_system(MSG_ENGINE_LOST, "error")
+            if draft:
+                self.draft_model = self._load_local_model(DRAFT_MODEL_SIZE)
+            else:
+                self.model = self._load_local_model(self.model_settings.model_size)
+            return self._decode_segments(audio, lang, metrics, stage, draft)
+
+    def _trim_for_decode(self, audio: np.ndarray, metrics: TakeMetrics) -> VadResult:
+        """Runs the VAD stage; the model is skipped when no speech is found."""
+        audio = audio.reshape(-1)
+        settings = self.config_manager.performance
+        if not settings.vad_enabled:
+            duration = len(audio) / SAMPLE_RATE
+            return VadResult(audio, True, duration, duration)
+        with metrics.span("vad"):
+            vad = trim_silence(audio, SAMPLE_RATE, settings.vad)
+        print(f"VAD: kept {vad.kept_s:.1f}s of {vad.input_s:.1f}s (removed {vad.removed_s:.1f}s)")
+        return vad
+
+    def _stop_recorder(self, metrics: TakeMetrics) -> np.ndarray | None:
+        metrics.add("dispatch", time.perf_counter() - metrics.t0)
+        with metrics.span("stop"):
             audio = self.recorder.stop()
-            
+        for name, seconds in self.recorder.last_stop_timings.items():
+            metrics.add(name, seconds)
+        metrics.set(
+            audio_s=round(self.recorder.buffer.total_written / SAMPLE_RATE, 3),
+            input_overflows=self.recorder.input_overflows,
+            overflow_samples=self.recorder.overflow_samples,
+        )
+        return audio
+
+    def _deliver(self, take: Take, ui_action, text: str = ""):
+        """Hands the result to Tk, timing the hop, then records the take (and its transcript, if any)."""
+        metrics = take.metrics
+        scheduled = time.perf_counter()
+
+        def run():
+            if take.cancelled:
+                return
+            metrics.add("ui_hop", time.perf_counter() - scheduled)
+            with metrics.span("ui_update"):
+                ui_action()
+            self._report_take(take, text)
+
+        self.root.after(0, run)
+
+    def _report_take(self, take: Take, text: str):
+        record = take.metrics.finish()
+        self.executor.submit(self._persist_take, take, record, text)
+        if self.config_manager.show_timings:
+            self.append_system(format_take_metrics(record))
+
+    def _persist_take(self, take: Take, record: dict, text: str):
+        self.metrics_log.write(record)
+        if not text:
+            return
+        try:
+            entry_id = self.history.add(text, record)
+        except Exception as e:
+            print(f"History write error: {e}")
+            return
+        # Lets the trimmed window know which stored entries it still shows
+        self.root.after(0, lambda: self._link_history_entry(take.tag, entry_id))
+
+    # --------------------
+    # TRANSCRIPTION JOBS (run in order on the pipeline worker)
+    # --------------------
+    def _transcribe_take_job(self, take: Take, audio: np.ndarray | None):
+        """Trims silence and transcribes one whole take."""
+        metrics = take.metrics
+        metrics.add("queue_wait", time.perf_counter() - take.queued_at)
+        finished = True
+        try:
             if audio is None or len(audio) < SAMPLE_RATE * 0.5:
-                self.safe_append_system(MSG_NO_AUDIO)
+                self._deliver(take, lambda: self.append_system(MSG_NO_AUDIO))
+                return
+
+            vad = self._trim_for_decode(audio, metrics)
+            metrics.set(speech_s=round(vad.kept_s, 3))
+            if not vad.speech_found:
+                self._deliver(take, lambda: self.append_system(MSG_NO_SPEECH))
                 return
+            if vad.removed_s >= 0.5:
+                self.safe_append_system(MSG_VAD_TRIMMED.format(vad.removed_s, vad.input_s))
+            self._ensure_language(take, vad.audio)
+            self.take_cache.add(take.seq, vad.audio, take.language)
 
             self.safe_append_system(MSG_PROCESSING)
+
+            if self.config_manager.two_pass and self.draft_model is not None:
+                self._draft_then_final(take, vad.audio)
+                finished = False  # the final pass closes the take
+                return
             
-            # Transcription
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_name = tmp.name
-            
-            sf.write(tmp_name, audio, SAMPLE_RATE)
-            
-            segments, _ = self.model.transcribe(
-                tmp_name, language=lang, beam_size=5, condition_on_previous_text=False
-            )
-            full_text = " ".join(seg.text.strip() for seg in segments).strip()
+            full_text = self._transcribe(vad.audio, take.language, metrics)
+            self._check_cancelled(take)
             
             if full_text:
-                self.root.after(0, lambda: self.safe_append_and_copy(full_text))
+                self._deliver(take, lambda: self.safe_append_and_copy(full_text, take.tag), full_text)
             else:
-                self.safe_append_system(MSG_NO_AUDIO)
+                self._deliver(take, lambda: self.append_system(MSG_NO_AUDIO))
+
+            self.root.after(0, self._play_pip_sound)
+
+        except Exception as e:
+            self._job_failed(take, e)
+        finally:
+            if finished:
+                self.pipeline.finish_take(take)
 
-            # Cleanup
-            if os.path.exists(tmp_name):
-                os.remove(tmp_name)
-                
+    def _draft_then_final(self, take: Take, audio: np.ndarray):
+        """Shows and copies a fast draft, then queues a re-decode of the same buffer with the configured model."""
+        take_tag = take.tag
+        draft_text = self._transcribe(audio, take.language, take.metrics, stage="draft_decode", draft=True)
+        self._check_cancelled(take)
+        if draft_text:
+            def show_draft():
+                self.append_draft_and_copy(draft_text, take_tag)
+                take.metrics.mark("draft_visible_s")
+            self.root.after(0, show_draft)
             self.root.after(0, self._play_pip_sound)
+        # Queued behind takes already waiting, so their drafts are not held up by this final pass
+        self.pipeline.submit(take, self._final_pass_job, take, audio, draft_text, take_tag)
+
+    def _final_pass_job(self, take: Take, audio: np.ndarray, draft_text: str, take_tag: str):
+        metrics = take.metrics
+        try:
+            final_text = self._transcribe(audio, take.language, metrics, stage="final_decode")
+            self._check_cancelled(take)
+            if draft_text:
+                self._deliver(take, lambda: self.replace_draft(take_tag, draft_text, final_text), final_text or draft_text)
+            elif final_text:
+                self._deliver(take, lambda: self.safe_append_and_copy(final_text, take_tag), final_text)
+            else:
+                self._deliver(take, lambda: self.append_system(MSG_NO_AUDIO))
+        except Exception as e:
+            self._job_failed(take, e)
+        finally:
+            self.pipeline.finish_take(take)
+
+    def _long_form_job(self, take: Take):
+        """Decodes a spilled recording window by window; on failure the checkpoint is kept for the next start."""
+        session, metrics = take.long_form, take.metrics
+        progress_tag = f"progress{take.seq}"
+        metrics.set(audio_s=round(len(session.audio()) / SAMPLE_RATE, 3))
 
+        def progress(window: int, total: int):
+            text = MSG_LONG_FORM_PROGRESS.format(window, total, 100 * (window - 1) / total)
+            self.root.after(0, lambda: self.show_progress(progress_tag, text))
+
+        def decode(chunk: np.ndarray) -> list:
+            self._check_cancelled(take)  # also stops an in-process decode between windows
+            return self._decode_segments(chunk, session.state["language"], metrics)
+
+        try:
+            self.safe_append_system(MSG_PROCESSING)
+            if session.state["language"] is None:
+                self._ensure_language(take, session.audio()[:int(LONG_FORM_WINDOW_S * SAMPLE_RATE)])
+                session.state["language"] = take.language
+                session.save()
+            full_text = session.transcribe(decode, progress)
+            metrics.set(windows=session.state["next_window"])
+            self.root.after(0, lambda: self.clear_progress(progress_tag))
+            if full_text:
+                self._deliver(take, lambda: self.safe_append_and_copy(full_text, take.tag), full_text)
+                self.root.after(0, self._play_pip_sound)
+            else:
+                self._deliver(take, lambda: self.append_system(MSG_NO_AUDIO))
+            session.remove()
+        except Exception as e:
+            if take.cancelled:
+                self.root.after(0, lambda: self.clear_progress(progress_tag))
+                session.remove()
+            self._job_failed(take, e)
+        finally:
+            self.pipeline.finish_take(take)
+
+    def _update_retranscribe_menu(self):
+        """Greys out the size that is already the loaded model, which the settings can change at any time."""
+        current = self.model_settings.model_size if self.model_settings else self.config_manager.performance.model_size
+        for size, index in self.retranscribe_model_entries.items():
+            self.retranscribe_menu.entryconfigure(index, state="disabled" if size == current else "normal")
+
+    def _fill_retranscribe_take_menu(self):
+        """Lists the cached takes each time the menu opens; the choice applies to the entries below it."""
+        self.retranscribe_take_menu.delete(0, "end")
+        recent = self.take_cache.recent()
+        if self.retranscribe_seq_var.get() not in [c.seq for c in recent]:
+            self.retranscribe_seq_var.set(0)
+        self.retranscribe_take_menu.add_radiobutton(label="Latest", value=0, variable=self.retranscribe_seq_var)
+        for cached in recent:
+            label = f"#{cached.seq} ({len(cached.pcm) / SAMPLE_RATE:.0f}s, {LANG_CHOICES[cached.language or LANG_AUTO].name})"
+            self.retranscribe_take_menu.add_radiobutton(label=label, value=cached.seq, variable=self.retranscribe_seq_var)
+
+    def retranscribe(self, language: str | None = None, beam_size: int | None = None, model_size: str | None = None, seq: int | None = None):
+        """Decodes a cached take (the most recent one by default) again with another language, beam size or model."""
+        cached = self.take_cache.get(seq) if seq else self.take_cache.latest()
+        if cached is None:
+            if seq:
+                self.append_system(MSG_TAKE_NOT_CACHED.format(seq, self.take_cache.size), "error")
+            else:
+                self.append_system(MSG_NOTHING_TO_RETRANSCRIBE, "error")
+            return
+        if self.model_loading:
+            self.append_system(MSG_LOADING_MODEL, tag="error")
+            return
+        if model_size == self.model_settings.model_size:
+            model_size = None
+        extra = None
+        if model_size:
+            # Another size loads on the executor, not the pipeline worker, so queued takes do not wait for it
+            if self.retranscribe_model is None or self.retranscribe_model.size != model_size:
+                if self.retranscribe_model_loading:
+                    self.append_system(MSG_RETRANSCRIBE_MODEL_BUSY.format(self.retranscribe_model_loading), "error")
+                    return
+                self.retranscribe_model_loading = model_size
+                self.append_system(MSG_LOADING_RETRANSCRIBE_MODEL.format(model_size))
+                retry = lambda: self.retranscribe(language, beam_size, model_size, cached.seq)
+                self.executor.submit(self._load_retranscribe_model_task, model_size, retry)
+                return
+            extra = self.retranscribe_model
+        language = language or cached.language
+        beam_size = beam_size or self.config_manager.performance.beam_size
+        take = Take(self.take_counter + 1, language, TakeMetrics("retranscribe", language or LANG_AUTO))
+        take.stopped.set()
+        if not self.pipeline.open_take(take):
+            self.append_system(MSG_QUEUE_FULL, "error")
+            return
+        self.take_counter = take.seq
+        details = ", ".join(filter(None, [LANG_CHOICES[language or LANG_AUTO].name, f"beam {beam_size}", model_size]))
+        self.append_system(MSG_RETRANSCRIBING.format(cached.seq, details))
+        if extra:
+            extra.acquire()
+        self.pipeline.submit(take, self._retranscribe_job, take, cached, beam_size, extra)
+
+    def _load_retranscribe_model_task(self, model_size: str, then):
+        """Loads another size for re-transcription, replacing the previous one; `then` runs on Tk once it is in."""
+        try:
+            model = self._load_model(model_size)
         except Exception as e:
+            self.retranscribe_model_loading = None
             self.safe_append_system(MSG_ERROR.format(e), "error")
+            return
+
+        def install():
+            self.retranscribe_model_loading = None
+            old, self.retranscribe_model = self.retranscribe_model, OnDemandModel(model_size, model)
+            if old is not None:
+                old.retire()
+            else:
+                self.root.after(RETRANSCRIBE_MODEL_IDLE_S * 1000, self._release_idle_retranscribe_model)
+            then()
+
+        self.root.after(0, install)
+
+    def _release_idle_retranscribe_model(self):
+        """Runs on Tk while an extra model is loaded: frees it after RETRANSCRIBE_MODEL_IDLE_S without use."""
+        extra = self.retranscribe_model
+        if extra is None:
+            return
+        idle = time.monotonic() - extra.last_used
+        if not extra.users and idle >= RETRANSCRIBE_MODEL_IDLE_S:
+            self.retranscribe_model = None
+            extra.retire()
+            print(f"Freed model {extra.size}, unused for {idle:.0f}s")
+            return
+        self.root.after(int(max(RETRANSCRIBE_MODEL_IDLE_S - idle, 1) * 1000), self._release_idle_retranscribe_model)
+
+    def _retranscribe_job(self, take: Take, cached: CachedTake, beam_size: int, extra: OnDemandModel | None):
+        metrics = take.metrics
+        try:
+            model_size = extra.size if extra else self.model_settings.model_size
+            model = extra.model if extra else self.model
+            if not cached.trimmed:
+                cached.replace_audio(self._trim_for_decode(cached.audio(), metrics).audio)
+            self._ensure_language(take, cached.audio())  # a take cached before its language was known
+            metrics.set(audio_s=round(len(cached.pcm) / SAMPLE_RATE, 3), source_take=cached.seq, beam_size=beam_size, model=model_size)
+
+            try:
+                segments = decode_cached_take(model, cached, take.language, beam_size, metrics)
+            except WorkerClosed:
+                if model is not self.model and model_size == self.model_settings.model_size:
+                    segments = decode_cached_take(self.model, cached, take.language, beam_size, metrics)
+                else:
+                    raise
+            except EngineUnavailable:
+                self.safe_append_system(MSG_ENGINE_LOST, "error")
+                self.model = self._load_local_model(self.model_settings.model_size)
+                segments = decode_cached_take(self.model, cached, take.language, beam_size, metrics)
+            text = " ".join(seg.text.strip() for seg in segments).strip()
+            self._check_cancelled(take)
+            cached.language = take.language
+
+            if text:
+                self._deliver(take, lambda: self.safe_append_and_copy(text, take.tag), text)
+                self.root.after(0, self._play_pip_sound)
+            else:
+                self._deliver(take, lambda: self.append_system(MSG_NO_AUDIO))
+        except Exception as e:
+            self._job_failed(take, e)
         finally:
-            # Unlock the UI
-            self.is_processing = False
-            self.root.after(0, self.update_record_button_style)
+            if extra:
+                extra.release()
+            self.pipeline.finish_take(take)
+
+    def _resume_long_form_sessions(self):
+        """Queues long recordings whose decode was interrupted by a crash or quit."""
+        for session in LongFormSession.find_unfinished():
+            language = session.state["language"]
+            take = Take(self.take_counter + 1, language, TakeMetrics("long_form", language or LANG_AUTO))
+            take.long_form = session
+            take.stopped.set()
+            if not self.pipeline.open_take(take):
+                return  # the rest are picked up on the next start
+            self.take_counter = take.seq
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(session.state["created"]))
+            total = len(session.windows(len(session.audio())))
+            self.append_system(MSG_LONG_FORM_RESUMING.format(created, session.state["next_window"], total))
+            self.pipeline.submit(take, self._long_form_job, take)
+
+    def _stream_poll_task(self, take: Take):
+        """Runs in background thread while recording: cuts live audio at pauses and queues each finished chunk."""
+        try:
+            while not take.stopped.wait(STREAM_POLL_S):
+                for chunk in take.chunker.feed(self.recorder.drain()):
+                    self.pipeline.submit(take, self._decode_chunk_job, take, chunk, "stream_decode")
+        except Exception as e:
+            self.safe_append_system(MSG_ERROR.format(e), "error")
+
+    def _decode_chunk_job(self, take: Take, chunk: np.ndarray, stage: str):
+        try:
+            vad = self._trim_for_decode(chunk, take.metrics)
+            text = ""
+            if vad.speech_found:
+                self._ensure_language(take, vad.audio)
+                text = self._transcribe(vad.audio, take.language, take.metrics, stage=stage)
+            self._check_cancelled(take)
+            if text:
+                take.texts.append(text)
+                self.root.after(0, lambda: self.append_partial(take, text))
+        except Exception as e:
+            self._job_failed(take, e)
+
+    def _finish_stream_job(self, take: Take):
+        """Queued after the tail chunks of a streaming take: copies the assembled text."""
+        full_text = " ".join(take.texts).strip()
+        cached = self.take_cache.get(take.seq)
+        if cached is not None and cached.language is None:
+            cached.language = take.language  # cached at stop, possibly before the language was known
+        self._deliver(take, lambda: self.finish_partial_and_copy(take, full_text), full_text)
+        if full_text:
+            self.root.after(0, self._play_pip_sound)
+        else:
+            self.safe_append_system(MSG_NO_AUDIO)
+        self.pipeline.finish_take(take)
+
+    def cancel_transcription(self):
+        """Abandons the take the worker is on; takes queued behind it carry on.
+
+        A worker-process model is interrupted mid-decode. An in-process model
+        cannot be, so its result is dropped when it arrives.
+        """
+        take = self.pipeline.running
+        if take is None or take.cancelled:
+            self.append_system(MSG_NOTHING_TO_CANCEL, "error")
+            return
+        take.cancelled = True
+        if take is self.current_take:
+            self.stop_take()  # a streaming take still recording: its remaining jobs are skipped
+        if take.streaming:
+            self.text_box.mark_unset(f"partial{take.seq}")
+        self.pipeline.finish_take(take)
+        if self.pipeline.running is take:
+            for model in self._loaded_models():
+                if isinstance(model, ProcessWhisperModel):
+                    model.cancel()
+        self.append_system(MSG_CANCELLED.format(take.seq), "error")
+
+    def _check_cancelled(self, take: Take):
+        if take.cancelled:
+            raise WorkerCancelled(f"take {take.seq} cancelled")
+
+    def _job_failed(self, take: Take, e: Exception):
+        """Reports a failed job; an interrupted decode of a cancelled take is expected and stays quiet."""
+        if take.cancelled:
+            print(f"Take {take.seq} cancelled: {e}")
+            return
+        self.safe_append_system(MSG_ERROR.format(e), "error")
 
     # --------------------
     # HELPERS
@@ -541,9 +3952,84 @@ class DictariaApp:
     def safe_append_system(self, text: str, tag: str = "sys"):
         self.root.after(0, lambda: self.append_system(text, tag))
 
-    def safe_append_and_copy(self, text: str):
-        self.text_box.insert(tk.END, text + "\n")
+    def safe_append_and_copy(self, text: str, take_tag: str = ""):
+        self.text_box.insert(tk.END, text, take_tag)
+        self.text_box.insert(tk.END, "\n")
+        self._trim_text_box()
+        self.text_box.see(tk.END)
+        self._copy_to_clipboard(text)
+
+    def append_draft_and_copy(self, text: str, take_tag: str):
+        self.text_box.insert(tk.END, text, ("draft", take_tag))
+        self.text_box.insert(tk.END, "\n")
+        self._trim_text_box()
+        self.text_box.see(tk.END)
+        self._copy_to_clipboard(text)
+
+    def replace_draft(self, take_tag: str, draft_text: str, final_text: str):
+        ranges = self.text_box.tag_ranges(take_tag)
+        if not final_text or final_text == draft_text:
+            if ranges:
+                self.text_box.tag_remove("draft", ranges[0], ranges[-1])
+            return
+        if ranges:
+            start, end = ranges[0], ranges[-1]
+            self.text_box.delete(start, end)
+            self.text_box.insert(start, final_text, take_tag)
+        else:
+            self.text_box.insert(tk.END, final_text, take_tag)
+            self.text_box.insert(tk.END, "\n")
+        self.text_box.see(tk.END)
+
+        # Only take the clipboard back if the user has not copied something else since
+        try:
+            clipboard = self.root.clipboard_get()
+        except tk.TclError:
+            clipboard = ""
+        if clipboard == draft_text:
+            self._copy_to_clipboard(final_text)
+        self.append_system(MSG_FINAL_REPLACED)
+
+    def begin_partial(self, take: Take):
+        """Reserves a line for streamed text; status messages keep appending below it."""
+        self.text_box.insert(tk.END, "\n")
+        self.text_box.mark_set(f"partial{take.seq}", "end-2c")
+        self.text_box.see(tk.END)
+
+    def append_partial(self, take: Take, text: str):
+        if take.cancelled:
+            return  # the partial mark is gone
+        self.text_box.insert(f"partial{take.seq}", text + " ", take.tag)
         self.text_box.see(tk.END)
+
+    def finish_partial_and_copy(self, take: Take, full_text: str):
+        mark = f"partial{take.seq}"
+        if full_text:
+            self._copy_to_clipboard(full_text)
+        else:
+            # Nothing was transcribed: drop the reserved empty line
+            self.text_box.delete(f"{mark} linestart", f"{mark} lineend + 1c")
+        self.text_box.mark_unset(mark)
+
+    def show_progress(self, tag: str, text: str):
+        """Keeps one status line per long job, rewritten in place."""
+        ranges = self.text_box.tag_ranges(tag)
+        if ranges:
+            self.text_box.delete(ranges[0], ranges[-1])
+            self.text_box.insert(ranges[0], text, ("sys", tag))
+        else:
+            self.text_box.insert(tk.END, text, ("sys", tag))
+            self.text_box.insert(tk.END, "\n", "sys")
+            self._trim_text_box()
+            self.text_box.see(tk.END)
+
+    def clear_progress(self, tag: str):
+        ranges = self.text_box.tag_ranges(tag)
+        if ranges:
+            self.text_box.delete(ranges[0], f"{ranges[-1]} + 1c")
+        self.text_box.tag_delete(tag)
+
+    def _copy_to_clipboard(self, text: str):
         try:
             self.root.clipboard_clear()
             self.root.clipboard_append(text)
@@ -553,10 +4039,109 @@ class DictariaApp:
 
     def append_system(self, text: str, tag: str = "sys"):
         self.text_box.insert(tk.END, text + "\n", tag)
+        self._trim_text_box()
         self.text_box.see(tk.END)
 
+    # --------------------
+    # HISTORY (bounded window, older entries paged in from the store)
+    # --------------------
+    def _trim_text_box(self):
+        """Drops the oldest lines once the window holds too many; they stay available from the store."""
+        lines = int(self.text_box.index("end-1c").split(".")[0])
+        if lines <= HISTORY_WIDGET_MAX_LINES + HISTORY_TRIM_SLACK_LINES:
+            return
+        cut = lines - HISTORY_WIDGET_MAX_LINES
+        # Never cut into a streaming take that is still filling its line
+        for mark in self.text_box.mark_names():
+            if mark.startswith("partial"):
+                cut = min(cut, int(self.text_box.index(mark).split(".")[0]) - 1)
+        if cut <= 0:
+            return
+        self.text_box.delete("1.0", f"{cut + 1}.0")
+        # Tags whose text is gone would otherwise accumulate for weeks
+        for tag in self.text_box.tag_names():
+            if tag.startswith(("take", "entry")) and not self.text_box.tag_ranges(tag):
+                self.text_box.tag_delete(tag)
+
+    def _link_history_entry(self, take_tag: str, entry_id: int):
+        ranges = self.text_box.tag_ranges(take_tag)
+        if ranges:
+            self.text_box.tag_add(f"entry{entry_id}", ranges[0], ranges[-1])
+
+    def _oldest_shown_entry(self) -> int | None:
+        ids = [int(tag[5:]) for tag in self.text_box.tag_names() if tag.startswith("entry") and self.text_box.tag_ranges(tag)]
+        return min(ids) if ids else None
+
+    def _on_user_scroll(self, event=None):
+        # Only scrolling by hand pages in history, never appends or the empty window at startup
+        if event is not None and event.num != 4 and event.delta <= 0:
+            return
+        self.root.after_idle(self._page_in_history_at_top)
+
+    def _page_in_history_at_top(self):
+        if self.text_box.yview()[0] == 0.0:
+            self._page_in_history()
+
+    def _page_in_history(self):
+        if self.history_paging:
+            return
+        self.history_paging = True
+        before = self._oldest_shown_entry()
+        future = self.executor.submit(self.history.before, before)
+        future.add_done_callback(lambda f: self.root.after(0, lambda: self._show_history_page(f)))
+
+    def _show_history_page(self, future: concurrent.futures.Future):
+        self.history_paging = False
+        try:
+            entries = future.result()
+        except Exception as e:
+            self.append_system(MSG_ERROR.format(e), "error")
+            return
+        if not entries:
+            return
+        # Keep the line that was at the top in view while older entries appear above it
+        self.text_box.mark_set("history_anchor", "1.0")
+        self.text_box.mark_gravity("history_anchor", tk.RIGHT)
+        for entry in reversed(entries):
+            self.text_box.insert("1.0", entry.text + "\n", ("history", f"entry{entry.id}"))
+            self.text_box.insert("1.0", f"[{entry.label()}]\n", "sys")
+        self.text_box.yview("history_anchor")
+        self.text_box.mark_unset("history_anchor")
+
+    def open_history_search(self):
+        """Separate window searching the full on-disk history; double-click copies an entry."""
+        window = tk.Toplevel(self.root, bg=self.theme["root_bg"])
+        window.title("Dictaria History")
+        window.geometry("520x420")
+        query_var = tk.StringVar(window)
+        entry = tk.Entry(window, textvariable=query_var, bg=self.theme["text_box_bg"], fg=self.theme["text_fg"], insertbackground="white", bd=0)
+        entry.pack(fill="x", padx=5, pady=5)
+        results = tk.Listbox(window, bg=self.theme["text_box_bg"], fg=self.theme["text_fg"], bd=0, highlightthickness=0, activestyle="none")
+        results.pack(fill="both", expand=True, padx=5, pady=(0, 5))
+        found: List[HistoryEntry] = []
+
+        def show(entries: List[HistoryEntry]):
+            found[:] = entries
+            results.delete(0, tk.END)
+            for e in entries:
+                results.insert(tk.END, f"[{e.label()}] {e.text}")
+
+        def run_search(event=None):
+            future = self.executor.submit(self.history.search, query_var.get().strip())
+            future.add_done_callback(lambda f: self.root.after(0, lambda: show(f.result()) if window.winfo_exists() else None))
+
+        def copy_selected(event=None):
+            selection = results.curselection()
+            if selection:
+                self._copy_to_clipboard(found[selection[0]].text)
+
+        entry.bind("<Return>", run_search)
+        results.bind("<Double-Button-1>", copy_selected)
+        entry.focus_set()
+        run_search()
+
     def update_record_button_style(self):
-        if self.model_loading or self.is_processing:
+        if self.model_loading or self.is_stopping:
             fill = self.theme["record_disabled_fill"]
             outline = self.theme["record_disabled_outline"]
         elif self.recorder.is_recording:
@@ -567,17 +4152,48 @@ class DictariaApp:
             outline = self.theme["record_idle_outline"]
 
         self.canvas_btn.itemconfig(self.record_indicator, fill=fill, outline=outline)
+        pending = self.pipeline.pending - (1 if self.current_take is not None else 0)
+        self.canvas_btn.itemconfig(self.queue_indicator, text=str(pending) if pending > 0 else "")
 
 
+COMMANDS = {
+    "daemon": run_daemon,
+    "batch": run_batch,
+    "tune": run_tune,
+    "ctl": run_ctl,
+    "serve": run_serve,
+    "client": run_client,
+}
+
 def main():
-    root = tk.Tk()
-    app = DictariaApp(root)
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
+    STARTUP.enabled = "--profile-startup" in sys.argv[1:]
+    STARTUP.record("module import", _PROCESS_T0, time.perf_counter())
+    with STARTUP.phase("tk init"):
+        root = tk.Tk()
+    with STARTUP.phase("app init"):
+        app = DictariaApp(root)
+
+    def on_first_map(event):
+        if event.widget is root:
+            STARTUP.mark("window visible")
+            root.unbind("<Map>")
+    root.bind("<Map>", on_first_map)
     
     # Clean shutdown of threads
     def on_close():
         if app.recorder.is_recording:
             app.recorder.stop()
         app.executor.shutdown(wait=False)
+        app.pipeline.shutdown()
+        app.history.close()
+        app.close_models()
+        app.config_manager.flush()
+        if app.control_server:
+            app.control_server.close()
         root.destroy()
         sys.exit(0)
 
@@ -0,0 +1,189 @@
+"""Offline transcription benchmark for Dictaria.
+
+Sweeps model size, compute type, beam size, cpu_threads and num_workers over
+synthesized (or supplied) fixture audio and writes machine-readable results
+that can be diffed between releases:
+
+    python dictaria_bench.py --models tiny,base --beam-sizes 1,5 -o bench.json
+    python dictaria_bench.py ... --baseline bench_previous.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import itertools
+import concurrent.futures
+import multiprocessing
+from typing import List, Dict
+
+import numpy as np
+
+import dictaria
+
+# --------------------
+# MEASUREMENT (runs in a fresh process per load configuration)
+# --------------------
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+def load_fixture(path: str | None, seconds: float) -> np.ndarray:
+    """A clip of exactly `seconds`: the fixture file tiled/cut to length, or synthesized speech."""
+    if not path:
+        return dictaria.synth_speech(seconds, seed=int(seconds))
+    from faster_whisper import decode_audio
+    audio = decode_audio(path, sampling_rate=dictaria.SAMPLE_RATE)
+    n = int(seconds * dictaria.SAMPLE_RATE)
+    return np.resize(audio, n).astype(np.float32)
+
+def _decode(model, audio: np.ndarray, beam_size: int, language: str) -> float:
+    t0 = time.perf_counter()
+    segments, _ = model.transcribe(audio, language=language, beam_size=beam_size, condition_on_previous_text=False)
+    for _ in segments:  # decoding happens lazily while iterating
+        pass
+    return time.perf_counter() - t0
+
+def measure_config(config: Dict, beam_sizes: List[int], clip_lengths: List[float], repeats: int, fixture: str | None, language: str) -> Dict:
+    """Loads one model configuration and times every beam size x clip length.
+
+    num_workers > 1 only pays off with concurrent calls, so each round issues
+    num_workers decodes in parallel and reports latency per call plus overall
+    real-time factor.
+    """
+    t0 = time.perf_counter()
+    model = dictaria.load_whisper_model(
+        config["model"],
+        cpu_threads=config["cpu_threads"],
+        num_workers=config["num_workers"],
+        device=config["device"],
+        compute_type=config["compute_type"],
+    )
+    load_s = time.perf_counter() - t0
+
+    clips = {length: load_fixture(fixture, length) for length in clip_lengths}
+    _decode(model, clips[min(clip_lengths)], 1, language)  # warm-up
+
+    runs = []
+    parallel = config["num_workers"]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as pool:
+        for beam_size, length in itertools.product(beam_sizes, clip_lengths):
+            latencies = []
+            wall = 0.0
+            for _ in range(repeats):
+                start = time.perf_counter()
+                latencies += list(pool.map(lambda clip: _decode(model, clip, beam_size, language), [clips[length]] * parallel))
+                wall += time.perf_counter() - start
+            runs.append({
+                "beam_size": beam_size,
+                "clip_s": length,
+                "calls": len(latencies),
+                "p50_s": round(float(np.percentile(latencies, 50)), 4),
+                "p95_s": round(float(np.percentile(latencies, 95)), 4),
+                "mean_s": round(float(np.mean(latencies)), 4),
+                "rtf": round(wall / (length * len(latencies)), 4),
+            })
+
+    return dict(config, load_s=round(load_s, 3), peak_rss_mb=peak_rss_mb(), runs=runs)
+
+# --------------------
+# REPORTING
+# --------------------
+def _run_key(result: Dict, run: Dict) -> tuple:
+    return (result["model"], result["device"], result["compute_type"], result["cpu_threads"], result["num_workers"], run["beam_size"], run["clip_s"])
+
+def print_table(results: List[Dict], baseline: Dict | None = None):
+    previous = {}
+    if baseline:
+        for result in baseline.get("results", []):
+            for run in result["runs"]:
+                previous[_run_key(result, run)] = run
+
+    print(f"{'model':<10} {'compute':<13} {'thr':>3} {'wrk':>3} {'beam':>4} {'clip':>5} {'p50':>8} {'p95':>8} {'RTF':>6} {'load':>6} {'RSS MB':>7}  vs base")
+    for result in results:
+        for run in result["runs"]:
+            before = previous.get(_run_key(result, run))
+            delta = f"{(run['p50_s'] / before['p50_s'] - 1) * 100:+.0f}%" if before and before["p50_s"] else ""
+            print(
+                f"{result['model']:<10} {result['compute_type']:<13} {result['cpu_threads']:>3} {result['num_workers']:>3} "
+                f"{run['beam_size']:>4} {run['clip_s']:>5.0f} {run['p50_s']:>8.3f} {run['p95_s']:>8.3f} {run['rtf']:>6.3f} "
+                f"{result['load_s']:>6.1f} {result['peak_rss_mb'] or 0:>7.0f}  {delta}"
+            )
+
+def environment() -> Dict:
+    versions = {}
+    for module in ("faster_whisper", "ctranslate2", "numpy"):
+        try:
+            versions[module] = __import__(module).__version__
+        except Exception:
+            versions[module] = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "versions": versions,
+    }
+
+# --------------------
+# CLI
+# --------------------
+def _csv(cast):
+    return lambda value: [cast(v) for v in value.split(",") if v]
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark Dictaria transcription settings offline.")
+    parser.add_argument("--models", type=_csv(str), default=[dictaria.MODEL_SIZE])
+    parser.add_argument("--device", default=dictaria.DEVICE)
+    parser.add_argument("--compute-types", type=_csv(str), default=[dictaria.COMPUTE_TYPE])
+    parser.add_argument("--beam-sizes", type=_csv(int), default=[1, dictaria.BEAM_SIZE])
+    parser.add_argument("--threads", type=_csv(int), default=[0], help="cpu_threads values (0 = CTranslate2 default)")
+    parser.add_argument("--workers", type=_csv(int), default=[1], help="num_workers values")
+    parser.add_argument("--clip-lengths", type=_csv(float), default=[3, 10, 30], help="Seconds")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--fixture", default=None, help="Audio file to use instead of synthesized speech")
+    parser.add_argument("--language", default=dictaria.LANG_CODES[0])
+    parser.add_argument("-o", "--output", default=None, help="Write results as JSON")
+    parser.add_argument("--baseline", default=None, help="Previous results JSON to compare p50 against")
+    args = parser.parse_args(argv)
+
+    configs = [
+        {"model": m, "device": args.device, "compute_type": c, "cpu_threads": t, "num_workers": w}
+        for m, c, t, w in itertools.product(args.models, args.compute_types, args.threads, args.workers)
+    ]
+
+    results = []
+    # A fresh process per configuration gives honest load times and per-config peak RSS
+    ctx = multiprocessing.get_context("spawn")
+    for n, config in enumerate(configs, 1):
+        print(f"[{n}/{len(configs)}] {config}", file=sys.stderr)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            future = pool.submit(measure_config, config, args.beam_sizes, args.clip_lengths, args.repeats, args.fixture, args.language)
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"  failed: {e}", file=sys.stderr)
+                results.append(dict(config, error=str(e), runs=[], load_s=None, peak_rss_mb=None))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    print_table([r for r in results if "error" not in r], baseline)
+
+    if args.output:
+        report = {"environment": environment(), "args": vars(args), "results": results}
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""Headless soak and latency harness for Dictaria.
+
+Runs record -> stop -> transcribe cycles through the app itself: a
+DictariaApp whose window is replaced by a headless stand-in, so takes go
+through toggle_record(), the take queue, the real transcription jobs, the
+take cache, the metrics log, the transcript store and the after() chain.
+There is no display and no microphone: a ReplaySource plays a fixture (or
+synthesized speech) through the recorder's callback, at real time or faster.
+Every --sample-s it reports end-to-end latency, dropped blocks, thread count
+and RSS, so leaks and regressions show up as trends:
+
+    python dictaria_soak.py --cycles 2000 --model tiny --speed 4 -o soak.json
+    python dictaria_soak.py --minutes 60 --model none --max-rss-growth-mb 20   # pipeline only, as a CI gate
+"""
+import os
+import sys
+import json
+import time
+import heapq
+import argparse
+import tempfile
+import contextlib
+import threading
+import itertools
+import traceback
+import concurrent.futures
+from collections import deque
+from types import SimpleNamespace
+from typing import List, Dict
+
+import numpy as np
+
+import dictaria
+from dictaria_bench import peak_rss_mb, load_fixture, environment
+
+# --------------------
+# MEASUREMENT
+# --------------------
+def rss_mb() -> float | None:
+    """Current resident set size; the peak from getrusage() only ever grows, so it is the last resort."""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().rss / 2**20, 1)
+    except ImportError:
+        return peak_rss_mb()
+
+def _percentiles(values: List[float]) -> Dict:
+    if not values:
+        return {"p50_s": None, "p99_s": None}
+    return {"p50_s": round(float(np.percentile(values, 50)), 4), "p99_s": round(float(np.percentile(values, 99)), 4)}
+
+# --------------------
+# HEADLESS APP
+# --------------------
+class HeadlessRoot:
+    """Stands in for the Tk root: after() callbacks run in order on the thread that calls pump(), like Tk's event loop."""
+
+    def __init__(self):
+        self._calls: List[tuple] = []  # heap of (due, order, fn, args)
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self.clipboard = ""
+        self.callback_errors = 0
+
+    def after(self, ms: int, fn, *args):
+        with self._cond:
+            heapq.heappush(self._calls, (time.monotonic() + ms / 1000, next(self._order), fn, args))
+            self._cond.notify()
+
+    def after_idle(self, fn, *args):
+        self.after(0, fn, *args)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._calls)
+
+    def pump(self, seconds: float = 0.0):
+        """Runs due callbacks for `seconds`, or until none are due when it is 0."""
+        deadline = time.monotonic() + seconds
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                if self._calls and self._calls[0][0] <= now:
+                    _, _, fn, args = heapq.heappop(self._calls)
+                elif now >= deadline:
+                    return
+                else:
+                    self._cond.wait(min(deadline, self._calls[0][0]) - now if self._calls else deadline - now)
+                    continue
+            try:
+                fn(*args)
+            except Exception:
+                self.callback_errors += 1  # Tk reports callback errors and carries on
+                traceback.print_exc()
+
+    def clipboard_clear(self):
+        self.clipboard = ""
+
+    def clipboard_append(self, text: str):
+        self.clipboard += text
+
+    def clipboard_get(self) -> str:
+        return self.clipboard
+
+class SilentModel:
+    """Used for --model none: answers at once, so everything around the model is what gets measured."""
+
+    def transcribe(self, audio: np.ndarray, language: str | None = None, **options):
+        duration = len(audio) / dictaria.SAMPLE_RATE
+        segment = SimpleNamespace(start=0.0, end=duration, text=" soak", avg_logprob=0.0, compression_ratio=1.0, no_speech_prob=0.0, words=None)
+        info = SimpleNamespace(language=language or dictaria.LANG_CODES[0], language_probability=1.0, duration=duration, duration_after_vad=duration)
+        return iter([segment]), info
+
+    def detect_language(self, audio: np.ndarray | None = None, **options):
+        probs = [(code, 1.0 if i == 0 else 0.0) for i, code in enumerate(dictaria.LANG_CODES)]
+        return probs[0][0], 1.0, probs
+
+class HeadlessApp(dictaria.DictariaApp):
+    """DictariaApp without a window: the real take flow and jobs, with the text box reduced to counters.
+
+    Takes go through toggle_record(), the take queue, the app's transcription
+    jobs (or the streaming chunker), the take cache, the metrics log and the
+    transcript store, and their UI updates through the after() chain. Only
+    the widgets are replaced.
+    """
+
+    def __init__(self, model, source: dictaria.ReplaySource, workdir: str, language: str,
+                 performance: dictaria.PerformanceSettings, streaming: bool, max_pending: int, warm: bool):
+        config_manager = dictaria.ConfigManager(os.path.join(workdir, "config.json"), language)
+        config_manager.performance = performance
+        config_manager.streaming = streaming
+        config_manager.two_pass = False
+        config_manager.long_form = False  # sessions would be written to the user's long-form directory
+        config_manager.show_timings = False
+        config_manager.warm_stream = warm
+        self._init_state(
+            HeadlessRoot(), config_manager, dictaria.AudioRecorder(dictaria.SAMPLE_RATE, source=source),
+            dictaria.MetricsLog(os.path.join(workdir, "metrics.jsonl")),
+            dictaria.TranscriptStore(os.path.join(workdir, "history.sqlite3")),
+            max_pending,
+        )
+        # What _load_model_task() does once the model is up
+        self.model = model
+        self.model_settings = performance
+        self.model_loading = False
+        if warm:
+            self._apply_warm_stream()
+
+        self.completed = 0
+        self.errors = 0
+        self.latencies: List[float] = []  # stop -> text delivered, every take in completion order
+        self.messages: deque[str] = deque(maxlen=50)
+        self._lock = threading.Lock()
+
+    def _persist_take(self, take: dictaria.Take, record: dict, text: str):
+        super()._persist_take(take, record, text)
+        with self._lock:
+            self.latencies.append(record["total_s"])  # the take's clock restarts at stop
+            self.completed += 1
+
+    def append_system(self, text: str, tag: str = "sys"):
+        self.messages.append(text)
+        if tag == "error":
+            print(text, file=sys.stderr)
+            with self._lock:
+                self.errors += 1
+
+    def safe_append_and_copy(self, text: str, take_tag: str = ""):
+        self._copy_to_clipboard(text)
+
+    def append_draft_and_copy(self, text: str, take_tag: str):
+        self._copy_to_clipboard(text)
+
+    def finish_partial_and_copy(self, take: dictaria.Take, full_text: str):
+        if full_text:
+            self._copy_to_clipboard(full_text)
+
+    def begin_partial(self, take: dictaria.Take):
+        pass
+
+    def append_partial(self, take: dictaria.Take, text: str):
+        pass
+
+    def show_progress(self, tag: str, text: str):
+        pass
+
+    def clear_progress(self, tag: str):
+        pass
+
+    def update_record_button_style(self):
+        pass
+
+    def _link_history_entry(self, take_tag: str, entry_id: int):
+        pass
+
+    def _play_pip_sound(self):
+        pass
+
+    def close(self):
+        if self.recorder.is_recording:
+            self.recorder.stop()
+        self.recorder.set_warm(False)
+        self.executor.shutdown(wait=True)
+        self.pipeline.shutdown()
+        self.history.close()
+        self.close_models()
+
+class Soak:
+    """Drives takes the way a user does: click, speak for take_s, click again, while the after() chain keeps running."""
+
+    def __init__(self, app: HeadlessApp, source: dictaria.ReplaySource, take_s: float):
+        self.app = app
+        self.source = source
+        self.take_s = take_s
+        self.started = 0
+
+    def cycle(self):
+        app = self.app
+        while app.is_stopping or app.pipeline.pending >= app.pipeline.max_pending:
+            app.root.pump(0.01)  # like a user waiting for the button, rather than getting "queue full"
+        app.toggle_record()
+        self.started += 1
+        app.root.pump(self.take_s / self.source.speed)
+        app.toggle_record()
+
+    def drain(self, timeout: float = 600):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and (self.app.is_stopping or self.app.pipeline.pending or self.app.root.pending()):
+            self.app.root.pump(0.05)
+        self.app.executor.submit(lambda: None).result()  # the last _persist_take has run
+
+    def sample(self, t0: float, since: int) -> Dict:
+        app = self.app
+        with app._lock:
+            window = app.latencies[since:]
+            completed, errors = app.completed, app.errors
+        return dict(
+            {"elapsed_s": round(time.perf_counter() - t0, 1), "completed": completed, "errors": errors + app.root.callback_errors},
+            **_percentiles(window),
+            pending=app.pipeline.pending,
+            dropped_blocks=self.source.blocks_dropped,
+            input_overflows=app.recorder.input_overflows,
+            threads=threading.active_count(),
+            rss_mb=rss_mb(),
+        )
+
+# --------------------
+# REPORTING
+# --------------------
+def print_sample(sample: Dict, header: bool = False, file=None):
+    file = file or sys.stdout
+    if header:
+        print(f"{'elapsed':>8} {'takes':>6} {'err':>4} {'p50':>7} {'p99':>7} {'queue':>5} {'dropped':>7} {'xruns':>5} {'thr':>4} {'RSS MB':>7}", file=file)
+    p50 = f"{sample['p50_s']:.3f}" if sample["p50_s"] is not None else "-"
+    p99 = f"{sample['p99_s']:.3f}" if sample["p99_s"] is not None else "-"
+    print(
+        f"{sample['elapsed_s']:>7.0f}s {sample['completed']:>6} {sample['errors']:>4} {p50:>7} {p99:>7} {sample['pending']:>5} "
+        f"{sample['dropped_blocks']:>7} {sample['input_overflows']:>5} {sample['threads']:>4} {sample['rss_mb'] or 0:>7.1f}",
+        file=file, flush=True,
+    )
+
+def summarize(samples: List[Dict], latencies: List[float]) -> Dict:
+    """Totals plus growth between the first sample (after warm-up) and the last, with an RSS trend per hour."""
+    first, last = samples[0], samples[-1]
+    summary = dict(_percentiles(latencies), takes=len(latencies), errors=last["errors"],
+                   dropped_blocks=last["dropped_blocks"], input_overflows=last["input_overflows"],
+                   thread_growth=last["threads"] - first["threads"])
+    if first["rss_mb"] is not None and last["rss_mb"] is not None:
+        summary["rss_growth_mb"] = round(last["rss_mb"] - first["rss_mb"], 1)
+        if len(samples) >= 3 and last["elapsed_s"] > first["elapsed_s"]:
+            t = np.array([s["elapsed_s"] for s in samples]) / 3600
+            slope = np.polyfit(t, np.array([s["rss_mb"] for s in samples]), 1)[0]
+            summary["rss_trend_mb_per_h"] = round(float(slope), 1)
+    return summary
+
+# --------------------
+# CLI
+# --------------------
+def run_cycles(soak: Soak, args: argparse.Namespace, report) -> List[Dict]:
+    print(f"Warm-up: {args.warmup_cycles} takes", file=sys.stderr)
+    for _ in range(args.warmup_cycles):
+        soak.cycle()
+    soak.drain()
+
+    t0 = time.perf_counter()
+    deadline = t0 + args.minutes * 60 if args.minutes else None
+    since = len(soak.app.latencies)
+    samples = [soak.sample(t0, since)]
+    print_sample(samples[0], header=True, file=report)
+    next_sample = t0 + args.sample_s
+    for _ in range(args.cycles):
+        if deadline and time.perf_counter() >= deadline:
+            break
+        soak.cycle()
+        if time.perf_counter() >= next_sample:
+            samples.append(soak.sample(t0, since))
+            since = len(soak.app.latencies)
+            print_sample(samples[-1], file=report)
+            next_sample += args.sample_s
+    soak.drain()
+    samples.append(soak.sample(t0, since))
+    print_sample(samples[-1], file=report)
+    return samples
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Soak-test the record -> transcribe pipeline without a display or microphone.")
+    parser.add_argument("--cycles", type=int, default=1000, help="Takes to run (stops earlier if --minutes is reached)")
+    parser.add_argument("--minutes", type=float, default=None)
+    parser.add_argument("--take-s", type=float, default=4.0, help="Seconds of audio per take")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed; 4 records a 4 s take in 1 s")
+    parser.add_argument("--model", default="tiny", help="Model to decode with, or 'none' to exercise everything but the model")
+    parser.add_argument("--engine", choices=["worker", "inprocess"], default="worker" if dictaria.WORKER_PROCESS else "inprocess",
+                        help="Decode in a worker process, as the app does by default (shared memory and pipe included), or in this process")
+    parser.add_argument("--beam-size", type=int, default=dictaria.BEAM_SIZE)
+    parser.add_argument("--language", default=dictaria.LANG_CODES[0], choices=list(dictaria.LANG_CHOICES), help="A language code, or 'auto' to detect it per take")
+    parser.add_argument("--streaming", action="store_true", help="Transcribe while recording (streaming mode)")
+    parser.add_argument("--fixture", default=None, help="Audio file to replay instead of synthesized speech")
+    parser.add_argument("--max-pending", type=int, default=dictaria.MAX_PENDING_TAKES)
+    parser.add_argument("--warm", action="store_true", help="Keep the stream open between takes (warm-stream mode)")
+    parser.add_argument("--sample-s", type=float, default=30.0, help="Seconds between report lines")
+    parser.add_argument("--warmup-cycles", type=int, default=20, help="Takes run before the first sample, excluded from growth")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=None, help="Exit 1 if RSS grows more than this")
+    parser.add_argument("--max-p99-s", type=float, default=None, help="Exit 1 if p99 latency exceeds this")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own log lines between the report lines")
+    parser.add_argument("-o", "--output", default=None, help="Write samples and summary as JSON")
+    args = parser.parse_args(argv)
+
+    if args.model == "none":
+        model = SilentModel()
+    elif args.engine == "worker":
+        model = dictaria.ProcessWhisperModel(args.model, dictaria.saved_load_kwargs())
+    else:
+        model = dictaria.load_whisper_model(args.model, **dictaria.saved_load_kwargs())
+    performance = dictaria.PerformanceSettings()._replace(model_size=args.model, beam_size=args.beam_size)
+    source = dictaria.ReplaySource(load_fixture(args.fixture, max(args.take_s * 3, 30.0)), speed=args.speed)
+    with tempfile.TemporaryDirectory(prefix="dictaria-soak-") as workdir:
+        app = HeadlessApp(model, source, workdir, args.language, performance, args.streaming, args.max_pending, args.warm)
+        soak = Soak(app, source, args.take_s)
+        report = sys.stdout
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+                samples = run_cycles(soak, args, report)
+        finally:
+            app.close()
+
+    summary = summarize(samples, app.latencies[args.warmup_cycles:])
+    print(json.dumps(summary), file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "args": vars(args), "samples": samples, "summary": summary}, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+    failed = []
+    if args.max_rss_growth_mb is not None and summary.get("rss_growth_mb", 0) > args.max_rss_growth_mb:
+        failed.append(f"RSS grew {summary['rss_growth_mb']} MB (limit {args.max_rss_growth_mb})")
+    if args.max_p99_s is not None and summary["p99_s"] is not None and summary["p99_s"] > args.max_p99_s:
+        failed.append(f"p99 latency {summary['p99_s']}s (limit {args.max_p99_s}s)")
+    if failed:
+        sys.exit("; ".join(failed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+
+import dictaria
+
+
+def ramp(start: int, n: int) -> np.ndarray:
+    return np.arange(start, start + n, dtype=np.float32)
+
+
+def make_ring(capacity: int) -> dictaria.AudioRingBuffer:
+    ring = dictaria.AudioRingBuffer(sample_rate=capacity, max_seconds=1)
+    ring.reset()
+    return ring
+
+
+def test_ring_keeps_order_across_wrap():
+    ring = make_ring(10)
+    ring.write(ramp(0, 7))
+    ring.write(ramp(7, 6))
+    assert ring.total_written == 13
+    assert ring.overflow_samples == 3
+    np.testing.assert_array_equal(ring.snapshot(), ramp(3, 10))
+
+
+def test_ring_counts_each_lost_sample_once_for_an_oversized_block():
+    ring = make_ring(1000)
+    ring.write(ramp(0, 500))
+    ring.write(ramp(500, 9500))
+    assert ring.total_written == 10000
+    assert ring.overflow_samples == 9000
+    np.testing.assert_array_equal(ring.snapshot(), ramp(9000, 1000))
+
+
+def test_ring_read_since_skips_overwritten_audio():
+    ring = make_ring(10)
+    ring.write(ramp(0, 4))
+    chunk, pos = ring.read_since(0)
+    np.testing.assert_array_equal(chunk, ramp(0, 4))
+    ring.write(ramp(4, 15))
+    chunk, pos = ring.read_since(pos)
+    assert pos == 19
+    np.testing.assert_array_equal(chunk, ramp(9, 10))
+
+
+def test_ring_reset_starts_a_new_take():
+    ring = make_ring(10)
+    ring.write(ramp(0, 25))
+    ring.reset()
+    ring.write(ramp(100, 3))
+    assert (ring.total_written, ring.overflow_samples) == (3, 0)
+    np.testing.assert_array_equal(ring.snapshot(), ramp(100, 3))
+
+
+def test_spill_buffer_grows_and_closes_at_the_take_length(tmp_path):
+    path = str(tmp_path / "audio.f32")
+    spill = dictaria.SpillBuffer(path, sample_rate=100, grow_s=1)
+    for start in range(0, 1000, 64):
+        spill.write(ramp(start, 64))
+    np.testing.assert_array_equal(spill.snapshot(), ramp(0, 1024))
+    chunk, pos = spill.read_since(1000)
+    np.testing.assert_array_equal(chunk, ramp(1000, 24))
+    spill.close()
+    assert os.path.getsize(path) == 1024 * 4